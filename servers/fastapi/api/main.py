@@ -2,14 +2,14 @@ import asyncio
 import os
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import SQLModel
 from contextlib import asynccontextmanager
 
 from api.models import SelectedLLMProvider
 from api.routers.presentation.router import presentation_router
-from api.services.database import sql_engine
+from api.services.database import migrate_database
+from api.services.instances import LLM_CLIENT_SERVICE, PROCESS_POOL_SERVICE
 from api.utils.supported_ollama_models import SUPPORTED_OLLAMA_MODELS
-from api.utils.utils import update_env_with_user_config
+from api.utils.utils import get_user_config, update_env_with_user_config
 from api.utils.model_utils import (
     get_selected_llm_provider,
     is_custom_llm_selected,
@@ -23,18 +23,19 @@ can_change_keys = os.getenv("CAN_CHANGE_KEYS") != "false"
 
 async def check_llm_model_availability():
     if not can_change_keys:
+        user_config = get_user_config()
         if get_selected_llm_provider() == SelectedLLMProvider.OPENAI:
-            openai_api_key = os.getenv("OPENAI_API_KEY")
+            openai_api_key = user_config.OPENAI_API_KEY
             if not openai_api_key:
                 raise Exception("OPENAI_API_KEY must be provided")
 
         elif get_selected_llm_provider() == SelectedLLMProvider.GOOGLE:
-            google_api_key = os.getenv("GOOGLE_API_KEY")
+            google_api_key = user_config.GOOGLE_API_KEY
             if not google_api_key:
                 raise Exception("GOOGLE_API_KEY must be provided")
 
         elif is_ollama_selected():
-            ollama_model = os.getenv("OLLAMA_MODEL")
+            ollama_model = user_config.OLLAMA_MODEL
             if not ollama_model:
                 raise Exception("OLLAMA_MODEL must be provided")
 
@@ -49,9 +50,9 @@ async def check_llm_model_availability():
             print("-" * 50)
 
         elif is_custom_llm_selected():
-            custom_model = os.getenv("CUSTOM_MODEL")
-            custom_llm_url = os.getenv("CUSTOM_LLM_URL")
-            custom_llm_api_key = os.getenv("CUSTOM_LLM_API_KEY")
+            custom_model = user_config.CUSTOM_MODEL
+            custom_llm_url = user_config.CUSTOM_LLM_URL
+            custom_llm_api_key = user_config.CUSTOM_LLM_API_KEY
             if not custom_model:
                 raise Exception("CUSTOM_MODEL must be provided")
             if not custom_llm_url:
@@ -72,9 +73,11 @@ async def check_llm_model_availability():
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     os.makedirs(os.getenv("APP_DATA_DIRECTORY"), exist_ok=True)
-    SQLModel.metadata.create_all(sql_engine)
+    migrate_database()
     await check_llm_model_availability()
     yield
+    PROCESS_POOL_SERVICE.shutdown()
+    await LLM_CLIENT_SERVICE.aclose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -1,9 +1,10 @@
 from enum import Enum
 import json
-from typing import Optional
-from pydantic import BaseModel
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict
 
 from api.sql_models import PresentationSqlModel
+from ppt_generator.models.slide_model import SlideModel
 
 
 class LogMetadata(BaseModel):
@@ -59,7 +60,34 @@ class SSECompleteResponse(BaseModel):
         ).to_string()
 
 
+class SSESlideCompleteResponse(BaseModel):
+    slide: SlideModel
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps(
+                {"type": "slide_complete", "slide": self.slide.model_dump(mode="json")}
+            ),
+        ).to_string()
+
+
+class SSEAssetResponse(BaseModel):
+    slide: int
+    asset_type: Literal["image", "icon"]
+    index: int
+    path: Optional[str]
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps({"type": "asset", **self.model_dump(mode="json")}),
+        ).to_string()
+
+
 class UserConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     LLM: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
     GOOGLE_API_KEY: Optional[str] = None
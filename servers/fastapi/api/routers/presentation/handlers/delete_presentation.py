@@ -3,7 +3,7 @@ import shutil
 from api.models import LogMetadata
 from api.services.logging import LoggingService
 from api.sql_models import PresentationSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.utils.utils import get_presentation_dir
 
 
@@ -20,10 +20,10 @@ class DeletePresentationHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(PresentationSqlModel, self.id)
-            sql_session.delete(presentation)
-            sql_session.commit()
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(PresentationSqlModel, self.id)
+            await sql_session.delete(presentation)
+            await sql_session.commit()
 
         if os.path.exists(self.presentation_dir):
             shutil.rmtree(self.presentation_dir)
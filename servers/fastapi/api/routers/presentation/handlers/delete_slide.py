@@ -1,6 +1,6 @@
 from api.models import LogMetadata
 from api.services.logging import LoggingService
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.sql_models import SlideSqlModel
 
 
@@ -15,7 +15,7 @@ class DeleteSlideHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            slide = sql_session.get(SlideSqlModel, self.id)
-            sql_session.delete(slide)
-            sql_session.commit()
+        async with get_async_sql_session() as sql_session:
+            slide = await sql_session.get(SlideSqlModel, self.id)
+            await sql_session.delete(slide)
+            await sql_session.commit()
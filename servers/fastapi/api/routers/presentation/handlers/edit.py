@@ -1,5 +1,4 @@
 import asyncio
-import os
 import uuid
 
 from sqlalchemy import update
@@ -14,6 +13,7 @@ from api.utils.supported_ollama_models import SUPPORTED_OLLAMA_MODELS
 from api.utils.utils import (
     get_presentation_dir,
     get_presentation_images_dir,
+    get_user_config,
 )
 from api.utils.model_utils import is_custom_llm_selected, is_ollama_selected
 from image_processor.icons_vectorstore_utils import get_icons_vectorstore
@@ -30,7 +30,7 @@ from ppt_generator.slide_generator import (
 )
 from ppt_generator.slide_model_utils import SlideModelUtils
 from api.sql_models import PresentationSqlModel, SlideSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 
 
 class PresentationEditHandler:
@@ -55,12 +55,16 @@ class PresentationEditHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(PresentationSqlModel, self.presentation_id)
-            slide_to_edit_sql = sql_session.exec(
-                select(SlideSqlModel).where(
-                    SlideSqlModel.index == self.slide_index,
-                    SlideSqlModel.presentation == self.presentation_id,
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
+                PresentationSqlModel, self.presentation_id
+            )
+            slide_to_edit_sql = (
+                await sql_session.exec(
+                    select(SlideSqlModel).where(
+                        SlideSqlModel.index == self.slide_index,
+                        SlideSqlModel.presentation == self.presentation_id,
+                    )
                 )
             ).first()
 
@@ -70,7 +74,7 @@ class PresentationEditHandler:
 
         supports_graph = not is_custom_llm_selected()
         if is_ollama_selected():
-            model = SUPPORTED_OLLAMA_MODELS[os.getenv("OLLAMA_MODEL")]
+            model = SUPPORTED_OLLAMA_MODELS[get_user_config().OLLAMA_MODEL]
             supports_graph = model.supports_graph
 
         if not supports_graph:
@@ -182,8 +186,8 @@ class PresentationEditHandler:
             if isinstance(new_slide_icons[each], IconQueryCollectionWithData):
                 new_slide_icons[each] = generate_icons.pop(0)
 
-        with get_sql_session() as sql_session:
-            sql_session.exec(
+        async with get_async_sql_session() as sql_session:
+            await sql_session.exec(
                 update(SlideSqlModel)
                 .where(SlideSqlModel.id == slide_to_edit.id)
                 .values(
@@ -193,9 +197,11 @@ class PresentationEditHandler:
                     content=new_slide_model.content.model_dump(mode="json"),
                 )
             )
-            sql_session.commit()
-            slide_to_edit_sql = sql_session.exec(
-                select(SlideSqlModel).where(SlideSqlModel.id == slide_to_edit.id)
+            await sql_session.commit()
+            slide_to_edit_sql = (
+                await sql_session.exec(
+                    select(SlideSqlModel).where(SlideSqlModel.id == slide_to_edit.id)
+                )
             ).first()
 
         logging_service.logger.info(
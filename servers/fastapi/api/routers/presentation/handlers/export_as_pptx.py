@@ -1,19 +1,34 @@
+import asyncio
 import os
+import queue
+import shutil
+from typing import BinaryIO, Iterator, Optional
+from urllib.parse import quote
 import uuid
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
 from api.models import LogMetadata
 from api.routers.presentation.mixins.fetch_presentation_assets import (
     FetchPresentationAssetsMixin,
 )
 from api.routers.presentation.models import (
     ExportAsRequest,
-    PresentationAndPath,
+    PresentationPptxExport,
 )
 from api.services.logging import LoggingService
 from api.services.instances import TEMP_FILE_SERVICE
 from api.sql_models import PresentationSqlModel
 from api.utils.utils import get_presentation_dir, sanitize_filename
 from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
+
+PPTX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+STREAM_CHUNK_SIZE = 64 * 1024
+# Chunks written ahead of the client before saving blocks
+STREAM_QUEUE_SIZE = 16
 
 
 class ExportAsPptxHandler(FetchPresentationAssetsMixin):
@@ -29,37 +44,46 @@ class ExportAsPptxHandler(FetchPresentationAssetsMixin):
     def __del__(self):
         TEMP_FILE_SERVICE.cleanup_temp_dir(self.temp_dir)
 
-    async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
-        logging_service.logger.info(
-            logging_service.message(self.data.model_dump(mode="json")),
-            extra=log_metadata.model_dump(),
-        )
-
+    async def create_ppt(self) -> PptxPresentationCreator:
         await self.fetch_presentation_assets()
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(
+        ppt_creator = PptxPresentationCreator(self.data.pptx_model, self.temp_dir)
+        await ppt_creator.prepare()
+        await asyncio.to_thread(ppt_creator.create_ppt)
+        return ppt_creator
+
+    async def get_ppt_name(self) -> str:
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
                 PresentationSqlModel, self.data.presentation_id
             )
+        return sanitize_filename(f"{presentation.title}.pptx")
 
-        ppt_path = os.path.join(
-            self.presentation_dir,
-            sanitize_filename(f"{presentation.title}.pptx")
+    async def update_presentation_file(self, ppt_path: str):
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
+                PresentationSqlModel, self.data.presentation_id
+            )
+            presentation.file = ppt_path
+            await sql_session.commit()
+
+    async def post(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        logging_service.logger.info(
+            logging_service.message(self.data.model_dump(mode="json")),
+            extra=log_metadata.model_dump(),
         )
-        ppt_creator = PptxPresentationCreator(self.data.pptx_model, self.temp_dir)
-        ppt_creator.create_ppt()
-        ppt_creator.save(ppt_path)
 
-        response = PresentationAndPath(
-            presentation_id=self.data.presentation_id, path=ppt_path
+        ppt_creator = await self.create_ppt()
+        ppt_path = os.path.join(self.presentation_dir, await self.get_ppt_name())
+        await asyncio.to_thread(ppt_creator.save, ppt_path)
+
+        response = PresentationPptxExport(
+            presentation_id=self.data.presentation_id,
+            path=ppt_path,
+            images=ppt_creator.get_images_report(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(
-                PresentationSqlModel, self.data.presentation_id
-            )
-            presentation.file = ppt_path
-            sql_session.commit()
+        await self.update_presentation_file(ppt_path)
 
         logging_service.logger.info(
             logging_service.message(response.model_dump(mode="json")),
@@ -67,3 +91,133 @@ class ExportAsPptxHandler(FetchPresentationAssetsMixin):
         )
 
         return response
+
+    async def stream(
+        self,
+        logging_service: LoggingService,
+        log_metadata: LogMetadata,
+        persist: bool = False,
+    ):
+        logging_service.logger.info(
+            logging_service.message(
+                {**self.data.model_dump(mode="json"), "persist": persist}
+            ),
+            extra=log_metadata.model_dump(),
+        )
+
+        ppt_creator = await self.create_ppt()
+        ppt_name = await self.get_ppt_name()
+        logging_service.logger.info(
+            logging_service.message(
+                ppt_creator.get_images_report().model_dump(mode="json")
+            ),
+            extra=log_metadata.model_dump(),
+        )
+
+        ppt_path = os.path.join(self.presentation_dir, ppt_name)
+        # Deck is written to the presentation directory only once complete
+        part_path = os.path.join(self.temp_dir, ppt_name)
+        part_file = open(part_path, "wb") if persist else None
+
+        # Zip entries are sent as python-pptx writes them
+        writer = PptxStreamWriter(part_file)
+        save_task = asyncio.create_task(
+            asyncio.to_thread(self.save_to_writer, ppt_creator, writer)
+        )
+
+        async def finish():
+            try:
+                await save_task
+            except StreamDisconnectedError:
+                # Client left before the deck was sent, nothing is persisted
+                return
+            finally:
+                if part_file:
+                    part_file.close()
+            if persist:
+                await asyncio.to_thread(shutil.move, part_path, ppt_path)
+                await self.update_presentation_file(ppt_path)
+
+        ascii_name = ppt_name.encode("ascii", "replace").decode().replace("?", "_")
+        return StreamingResponse(
+            writer.iterate(),
+            media_type=PPTX_MEDIA_TYPE,
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="{ascii_name}"; '
+                    f"filename*=UTF-8''{quote(ppt_name)}"
+                ),
+            },
+            background=BackgroundTask(finish),
+        )
+
+    def save_to_writer(
+        self, ppt_creator: PptxPresentationCreator, writer: "PptxStreamWriter"
+    ):
+        try:
+            ppt_creator.save(writer)
+        except StreamDisconnectedError:
+            raise
+        except BaseException as e:
+            writer.close(e)
+            raise
+        writer.close()
+
+
+class StreamDisconnectedError(OSError):
+    pass
+
+
+class PptxStreamWriter:
+    """
+    Write-only file python-pptx saves a deck into. Written bytes are handed
+    in chunks to the iterator of the response, and copied to file if given.
+    Zip archives are written without seeking to unseekable files.
+    """
+
+    def __init__(self, file: Optional[BinaryIO] = None):
+        self.file = file
+
+        self._queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._chunk = bytearray()
+        self._disconnected = False
+
+    def write(self, data: bytes) -> int:
+        if self.file:
+            self.file.write(data)
+        self._chunk += data
+        if len(self._chunk) >= STREAM_CHUNK_SIZE:
+            self._put(bytes(self._chunk))
+            self._chunk.clear()
+        return len(data)
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+
+    def close(self, error: Optional[BaseException] = None):
+        if self._chunk and not error:
+            self._put(bytes(self._chunk))
+        self._chunk.clear()
+        self._put(error)
+
+    def _put(self, item):
+        while not self._disconnected:
+            try:
+                self._queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
+        # Decks being persisted are still saved when the client is gone
+        if not self.file:
+            raise StreamDisconnectedError("Client disconnected from the export stream")
+
+    def iterate(self) -> Iterator[bytes]:
+        # Starlette iterates sync iterators in a thread, so blocking is fine
+        try:
+            while (item := self._queue.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self._disconnected = True
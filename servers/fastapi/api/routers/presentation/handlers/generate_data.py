@@ -1,4 +1,3 @@
-import os
 import random
 import uuid
 
@@ -10,7 +9,8 @@ from api.routers.presentation.handlers.list_supported_ollama_models import (
 from api.routers.presentation.models import PresentationGenerateRequest
 from api.services.logging import LoggingService
 from api.sql_models import KeyValueSqlModel, PresentationSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
+from api.utils.utils import get_user_config
 from api.utils.model_utils import is_custom_llm_selected, is_ollama_selected
 from ppt_config_generator.models import PresentationMarkdownModel, SlideStructureModel
 from ppt_config_generator.structure_generator import generate_presentation_structure
@@ -40,8 +40,8 @@ class PresentationGenerateDataHandler:
         )
 
         if is_ollama_selected() or is_custom_llm_selected():
-            with get_sql_session() as sql_session:
-                presentation = sql_session.get(
+            async with get_async_sql_session() as sql_session:
+                presentation = await sql_session.get(
                     PresentationSqlModel, self.data.presentation_id
                 )
                 presentation_structure = await generate_presentation_structure(
@@ -55,7 +55,7 @@ class PresentationGenerateDataHandler:
                 )
                 supports_graph = not is_custom_llm_selected()
                 if is_ollama_selected():
-                    model = SUPPORTED_OLLAMA_MODELS[os.getenv("OLLAMA_MODEL")]
+                    model = SUPPORTED_OLLAMA_MODELS[get_user_config().OLLAMA_MODEL]
                     supports_graph = model.supports_graph
 
                 for each in presentation_structure.slides:
@@ -89,13 +89,13 @@ class PresentationGenerateDataHandler:
                     ]
 
                 presentation.structure = presentation_structure.model_dump(mode="json")
-                sql_session.commit()
-                sql_session.refresh(presentation)
+                await sql_session.commit()
+                await sql_session.refresh(presentation)
 
-        with get_sql_session() as sql_session:
+        async with get_async_sql_session() as sql_session:
             sql_session.add(key_value_model)
-            sql_session.commit()
-            sql_session.refresh(key_value_model)
+            await sql_session.commit()
+            await sql_session.refresh(key_value_model)
 
         response = SessionModel(session=self.session)
         logging_service.logger.info(
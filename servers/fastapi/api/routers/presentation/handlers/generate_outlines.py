@@ -6,7 +6,7 @@ from api.services.instances import TEMP_FILE_SERVICE
 from api.services.logging import LoggingService
 from api.sql_models import PresentationSqlModel
 from ppt_config_generator.ppt_outlines_generator import generate_ppt_content
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 
 
 class PresentationOutlinesGenerateHandler:
@@ -26,8 +26,8 @@ class PresentationOutlinesGenerateHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
                 PresentationSqlModel, self.data.presentation_id
             )
 
@@ -47,8 +47,8 @@ class PresentationOutlinesGenerateHandler:
             ]
             presentation.notes = presentation_content.notes
 
-            sql_session.commit()
-            sql_session.refresh(presentation)
+            await sql_session.commit()
+            await sql_session.refresh(presentation)
 
         logging_service.logger.info(
             logging_service.message(presentation.model_dump(mode="json")),
@@ -14,7 +14,7 @@ from api.routers.presentation.models import (
     PresentationAndPath,
     PresentationPathAndEditPath,
 )
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.services.instances import TEMP_FILE_SERVICE
 from api.services.logging import LoggingService
 from api.sql_models import PresentationSqlModel, SlideSqlModel
@@ -129,12 +129,12 @@ class GeneratePresentationHandler(FetchAssetsOnPresentationGenerationMixin):
             notes=presentation_content.notes,
         )
 
-        with get_sql_session() as sql_session:
+        async with get_async_sql_session() as sql_session:
             sql_session.add(presentation)
             sql_session.add_all(slide_sql_models)
-            sql_session.commit()
+            await sql_session.commit()
             for each in slide_sql_models:
-                sql_session.refresh(each)
+                await sql_session.refresh(each)
 
         if self.data.export_as == "pptx":
             print("-" * 40)
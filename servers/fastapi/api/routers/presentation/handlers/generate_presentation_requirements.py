@@ -2,7 +2,7 @@ import uuid
 from api.models import LogMetadata
 from api.routers.presentation.models import GeneratePresentationRequirementsRequest
 from api.services.logging import LoggingService
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.services.instances import TEMP_FILE_SERVICE
 from api.sql_models import PresentationSqlModel
 from document_processor.loader import DocumentsLoader
@@ -46,10 +46,10 @@ class GeneratePresentationRequirementsHandler:
             summary=summary,
         )
 
-        with get_sql_session() as sql_session:
+        async with get_async_sql_session() as sql_session:
             sql_session.add(presentation)
-            sql_session.commit()
-            sql_session.refresh(presentation)
+            await sql_session.commit()
+            await sql_session.refresh(presentation)
 
         logging_service.logger.info(
             logging_service.message(presentation.model_dump(mode="json")),
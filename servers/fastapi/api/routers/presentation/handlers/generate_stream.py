@@ -1,24 +1,36 @@
+import asyncio
 import json
-from typing import List
+from typing import Dict, List, Set
 
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from sqlmodel import delete
 
-from api.models import LogMetadata, SSECompleteResponse, SSEResponse, SSEStatusResponse
+from api.models import (
+    LogMetadata,
+    SSECompleteResponse,
+    SSEResponse,
+    SSESlideCompleteResponse,
+    SSEStatusResponse,
+)
 
 from api.routers.presentation.mixins.fetch_assets_on_generation import (
     FetchAssetsOnPresentationGenerationMixin,
+    SlideAssetTask,
 )
 from api.routers.presentation.models import (
     PresentationAndSlides,
     PresentationGenerateRequest,
 )
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.services.logging import LoggingService
 from api.sql_models import KeyValueSqlModel, PresentationSqlModel, SlideSqlModel
 from api.utils.utils import get_presentation_dir
-from api.utils.model_utils import is_custom_llm_selected, is_ollama_selected
+from api.utils.model_utils import (
+    get_llm_concurrency,
+    is_custom_llm_selected,
+    is_ollama_selected,
+)
 from ppt_config_generator.models import (
     PresentationMarkdownModel,
     PresentationStructureModel,
@@ -33,6 +45,7 @@ from ppt_generator.models.slide_model import SlideModel
 from api.services.instances import TEMP_FILE_SERVICE
 
 from ppt_generator.slide_generator import get_slide_content_from_type_and_outline
+from ppt_generator.stream_parser import SlidesStreamParser
 
 
 class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin):
@@ -48,8 +61,8 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
         TEMP_FILE_SERVICE.cleanup_temp_dir(self.temp_dir)
 
     async def get(self, *args, **kwargs):
-        with get_sql_session() as sql_session:
-            key_value_model = sql_session.get(KeyValueSqlModel, self.session)
+        async with get_async_sql_session() as sql_session:
+            key_value_model = await sql_session.get(KeyValueSqlModel, self.session)
 
         if not key_value_model.value:
             raise HTTPException(400, "Data not found for provided session")
@@ -77,18 +90,20 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
         if not self.outlines:
             raise HTTPException(400, "Outlines can not be empty")
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(PresentationSqlModel, self.presentation_id)
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
+                PresentationSqlModel, self.presentation_id
+            )
             presentation.outlines = [each.model_dump() for each in self.outlines]
             presentation.title = self.title or presentation.title
             presentation.theme = self.theme
-            sql_session.exec(
+            await sql_session.exec(
                 delete(SlideSqlModel).where(
                     SlideSqlModel.presentation == self.presentation_id
                 )
             )
-            sql_session.commit()
-            sql_session.refresh(presentation)
+            await sql_session.commit()
+            await sql_session.refresh(presentation)
 
         self.presentation = presentation
 
@@ -97,39 +112,48 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
         ).to_string()
 
         self.presentation_json = None
-
-        # self.presentation_json will be mutated by the generator
-        if is_ollama_selected() or is_custom_llm_selected():
-            async for result in self.generate_presentation_ollama_custom():
-                yield result
-        else:
-            async for result in self.generate_presentation_openai_google():
+        # Slides validated while the presentation is still being generated,
+        # and the tasks fetching their assets by slide index
+        self.slide_models: List[SlideModel] = []
+        self.slide_assets_tasks: Dict[int, List[SlideAssetTask]] = {}
+        # Asset tasks already sent to the client
+        self.reported_assets_tasks: Set[asyncio.Task] = set()
+
+        try:
+            # self.presentation_json will be mutated by the generator
+            if is_ollama_selected() or is_custom_llm_selected():
+                generation = self.generate_presentation_ollama_custom()
+            else:
+                generation = self.generate_presentation_openai_google()
+            async for result in self.stream_slide_assets(
+                generation, self.slide_assets_tasks, self.reported_assets_tasks
+            ):
                 yield result
 
-        slide_models: List[SlideModel] = []
-        for i, slide in enumerate(self.presentation_json["slides"]):
-            slide["index"] = i
-            slide["presentation"] = self.presentation.id
-            slide["content"] = (
-                LLM_CONTENT_TYPE_MAPPING[slide["type"]](**slide["content"])
-                .to_content()
-                .model_dump(mode="json")
-            )
-            slide_model = SlideModel(**slide)
-            slide_models.append(slide_model)
+            slide_models = self.slide_models
+            for i, slide in enumerate(self.presentation_json["slides"]):
+                if i >= len(slide_models):
+                    slide_models.append(self.get_slide_model(slide, i))
 
-        async for result in self.fetch_slide_assets(slide_models):
-            yield result
+            async for result in self.fetch_slide_assets(
+                slide_models, self.slide_assets_tasks, self.reported_assets_tasks
+            ):
+                yield result
+        finally:
+            # Stops fetching assets if the client disconnects or generation fails
+            for slide_assets in self.slide_assets_tasks.values():
+                for _, _, task in slide_assets:
+                    task.cancel()
 
         slide_sql_models = [
             SlideSqlModel(**each.model_dump(mode="json")) for each in slide_models
         ]
 
-        with get_sql_session() as sql_session:
+        async with get_async_sql_session() as sql_session:
             sql_session.add_all(slide_sql_models)
-            sql_session.commit()
+            await sql_session.commit()
             for each in slide_sql_models:
-                sql_session.refresh(each)
+                await sql_session.refresh(each)
 
         yield SSEStatusResponse(status="Packing slide data").to_string()
 
@@ -139,8 +163,24 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
 
         yield SSECompleteResponse(key="presentation", value=response).to_string()
 
+    def add_generated_slide(self, slide_model: SlideModel):
+        self.slide_models.append(slide_model)
+        self.slide_assets_tasks[slide_model.index] = self.start_slide_assets(
+            slide_model
+        )
+
+    def get_slide_model(self, slide: dict, index: int) -> SlideModel:
+        slide["index"] = index
+        slide["presentation"] = self.presentation.id
+        slide["content"] = (
+            LLM_CONTENT_TYPE_MAPPING[slide["type"]](**slide["content"])
+            .to_content()
+            .model_dump(mode="json")
+        )
+        return SlideModel(**slide)
+
     async def generate_presentation_openai_google(self):
-        presentation_text = ""
+        stream_parser = SlidesStreamParser()
         async for event in await generate_presentation_stream(
             PresentationMarkdownModel(
                 title=self.title,
@@ -153,54 +193,82 @@ class PresentationGenerateStreamHandler(FetchAssetsOnPresentationGenerationMixin
             if chunk is None:
                 continue
 
-            presentation_text += chunk
+            completed_slides = stream_parser.feed(chunk)
 
             yield SSEResponse(
                 event="response",
                 data=json.dumps({"type": "chunk", "chunk": chunk}),
             ).to_string()
 
-        self.presentation_json = json.loads(presentation_text)
+            for slide in completed_slides:
+                slide_model = self.get_slide_model(slide, len(self.slide_models))
+                self.add_generated_slide(slide_model)
+                yield SSESlideCompleteResponse(slide=slide_model).to_string()
+
+        self.presentation_json = json.loads(stream_parser.text)
 
     async def generate_presentation_ollama_custom(self):
         presentation_structure = PresentationStructureModel(
             **self.presentation.structure
         )
+        semaphore = asyncio.Semaphore(get_llm_concurrency())
+
+        async def generate_slide_content(slide_type: int, index: int):
+            async with semaphore:
+                return await get_slide_content_from_type_and_outline(
+                    slide_type, self.outlines[index]
+                )
+
+        # All slide requests are started up front and bounded by the semaphore,
+        # chunks are still streamed in slide order
+        slide_content_tasks = [
+            asyncio.create_task(generate_slide_content(slide_structure.type, i))
+            for i, slide_structure in enumerate(presentation_structure.slides)
+        ]
+
         slide_models = []
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
-        ).to_string()
-        n_slides = len(presentation_structure.slides)
-        for i, slide_structure in enumerate(presentation_structure.slides):
-            # Informing about the start of the slide
-            # This is to make sure that the client renders slide n
-            # when it receives start chunk of slide n + 1
+        try:
             yield SSEResponse(
                 event="response",
-                data=json.dumps({"type": "chunk", "chunk": "{"}),
+                data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
             ).to_string()
-
-            slide_content = await get_slide_content_from_type_and_outline(
-                slide_structure.type, self.outlines[i]
-            )
-            slide_model = LLMSlideModel(
-                type=slide_structure.type,
-                content=slide_content.model_dump(mode="json"),
-            )
-            slide_models.append(slide_model)
-            chunk = json.dumps(slide_model.model_dump(mode="json"))
-
-            if i < n_slides - 1:
-                chunk += ","
+            n_slides = len(presentation_structure.slides)
+            for i, slide_structure in enumerate(presentation_structure.slides):
+                # Informing about the start of the slide
+                # This is to make sure that the client renders slide n
+                # when it receives start chunk of slide n + 1
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": "{"}),
+                ).to_string()
+
+                slide_content = await slide_content_tasks[i]
+                slide_model = LLMSlideModel(
+                    type=slide_structure.type,
+                    content=slide_content.model_dump(mode="json"),
+                )
+                slide_models.append(slide_model)
+                chunk = json.dumps(slide_model.model_dump(mode="json"))
+
+                if i < n_slides - 1:
+                    chunk += ","
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": chunk[1:]}),
+                ).to_string()
+
+                self.add_generated_slide(
+                    self.get_slide_model(slide_model.model_dump(mode="json"), i)
+                )
+                yield SSESlideCompleteResponse(slide=self.slide_models[-1]).to_string()
             yield SSEResponse(
                 event="response",
-                data=json.dumps({"type": "chunk", "chunk": chunk[1:]}),
+                data=json.dumps({"type": "chunk", "chunk": " ] }"}),
             ).to_string()
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": " ] }"}),
-        ).to_string()
+        finally:
+            # Stops pending requests if the client disconnects or a slide fails
+            for each in slide_content_tasks:
+                each.cancel()
 
         self.presentation_json = LLMPresentationModel(
             slides=slide_models,
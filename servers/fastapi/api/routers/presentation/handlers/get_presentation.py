@@ -5,7 +5,7 @@ from api.models import LogMetadata
 from api.routers.presentation.models import PresentationAndSlides
 from api.services.logging import LoggingService
 from api.sql_models import PresentationSqlModel, SlideSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 
 
 class GetPresentationHandler:
@@ -20,10 +20,12 @@ class GetPresentationHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(PresentationSqlModel, self.id)
-            slide_models = sql_session.exec(
-                select(SlideSqlModel).where(SlideSqlModel.presentation == self.id)
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(PresentationSqlModel, self.id)
+            slide_models = (
+                await sql_session.exec(
+                    select(SlideSqlModel).where(SlideSqlModel.presentation == self.id)
+                )
             ).all()
 
         response = PresentationAndSlides(
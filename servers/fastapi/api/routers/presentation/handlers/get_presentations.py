@@ -1,41 +1,70 @@
-from sqlmodel import select, exists
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlmodel import and_, or_, select
 from api.models import LogMetadata
 from api.routers.presentation.models import PresentationWithOneSlide
 from api.services.logging import LoggingService
 from api.sql_models import PresentationSqlModel, SlideSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 
 
 class GetPresentationsHandler:
 
+    def __init__(self, limit: Optional[int] = None, after: Optional[str] = None):
+        self.limit = limit
+        self.after = after
+
     async def get(self, logging_service: LoggingService, log_metadata: LogMetadata):
+        logging_service.logger.info(
+            logging_service.message({"limit": self.limit, "after": self.after}),
+            extra=log_metadata.model_dump(),
+        )
 
-        with get_sql_session() as sql_session:
-            # Get presentations that have at least one slide
-            presentations = sql_session.exec(
-                select(PresentationSqlModel).where(
-                    exists().where(
-                        SlideSqlModel.presentation == PresentationSqlModel.id
+        # Presentations are joined with their first slide,
+        # so presentations without slides are left out
+        query = (
+            select(PresentationSqlModel, SlideSqlModel)
+            .join(
+                SlideSqlModel,
+                and_(
+                    SlideSqlModel.presentation == PresentationSqlModel.id,
+                    SlideSqlModel.index == 0,
+                ),
+            )
+            .order_by(
+                PresentationSqlModel.created_at.desc(),
+                PresentationSqlModel.id.desc(),
+            )
+        )
+
+        async with get_async_sql_session() as sql_session:
+            if self.after:
+                cursor = await sql_session.get(PresentationSqlModel, self.after)
+                if not cursor:
+                    raise HTTPException(400, "Invalid cursor")
+                query = query.where(
+                    or_(
+                        PresentationSqlModel.created_at < cursor.created_at,
+                        and_(
+                            PresentationSqlModel.created_at == cursor.created_at,
+                            PresentationSqlModel.id < cursor.id,
+                        ),
                     )
                 )
-            ).all()
-        presentations.sort(key=lambda x: x.created_at, reverse=True)
-        presentations_with_slide = []
-        for presentation in presentations:
-            slide = sql_session.exec(
-                select(SlideSqlModel)
-                .where(SlideSqlModel.presentation == presentation.id)
-                .where(SlideSqlModel.index == 0)
-            ).first()
-            presentations_with_slide.append(
-                PresentationWithOneSlide.from_presentation_and_slide(
-                    presentation, slide
-                )
-            )
+            if self.limit:
+                query = query.limit(self.limit)
+
+            presentations_and_slides = (await sql_session.exec(query)).all()
+
+        presentations_with_slide = [
+            PresentationWithOneSlide.from_presentation_and_slide(presentation, slide)
+            for presentation, slide in presentations_and_slides
+        ]
 
         logging_service.logger.info(
             logging_service.message(
-                [each.model_dump(mode="json") for each in presentations]
+                [each.model_dump(mode="json") for each in presentations_with_slide]
             ),
             extra=log_metadata.model_dump(),
         )
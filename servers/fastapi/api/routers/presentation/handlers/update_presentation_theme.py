@@ -2,7 +2,7 @@ from api.models import LogMetadata
 from api.routers.presentation.models import UpdatePresentationThemeRequest
 from api.services.logging import LoggingService
 from api.sql_models import PreferencesSqlModel, PresentationSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 
 
 class UpdatePresentationThemeHandler:
@@ -16,17 +16,17 @@ class UpdatePresentationThemeHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
                 PresentationSqlModel, self.data.presentation_id
             )
-            preferences = sql_session.get(PreferencesSqlModel, 0)
+            preferences = await sql_session.get(PreferencesSqlModel, 0)
 
             if not preferences:
                 preferences = PreferencesSqlModel(id=0, theme=None)
                 sql_session.add(preferences)
-                sql_session.commit()
-                sql_session.refresh(preferences)
+                await sql_session.commit()
+                await sql_session.refresh(preferences)
 
             if self.data.theme:
                 theme_name = self.data.theme.get("name", None)
@@ -34,6 +34,6 @@ class UpdatePresentationThemeHandler:
                     preferences.theme = self.data.theme
 
             presentation.theme = self.data.theme
-            sql_session.commit()
+            await sql_session.commit()
 
         return {"message": "Theme updated successfully"}
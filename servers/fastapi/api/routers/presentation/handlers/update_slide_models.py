@@ -12,7 +12,7 @@ from api.routers.presentation.models import (
 from api.services.logging import LoggingService
 from api.sql_models import PresentationSqlModel, SlideSqlModel
 from api.utils.utils import download_files, get_presentation_dir, replace_file_name
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.services.instances import TEMP_FILE_SERVICE
 
 
@@ -57,19 +57,19 @@ class UpdateSlideModelsHandler:
         if images_download_links:
             await download_files(images_download_links, images_local_paths)
 
-        with get_sql_session() as sql_session:
+        async with get_async_sql_session() as sql_session:
             slide_sql_models = [
                 SlideSqlModel(**each.model_dump(mode="json")) for each in new_slides
             ]
             to_update_slides_ids = [each.id for each in slide_sql_models]
-            sql_session.exec(
+            await sql_session.exec(
                 delete(SlideSqlModel).where(SlideSqlModel.id.in_(to_update_slides_ids))
             )
             sql_session.add_all(slide_sql_models)
-            sql_session.commit()
+            await sql_session.commit()
             for each in slide_sql_models:
-                sql_session.refresh(each)
-            presentation = sql_session.get(PresentationSqlModel, presentation_id)
+                await sql_session.refresh(each)
+            presentation = await sql_session.get(PresentationSqlModel, presentation_id)
 
         response = PresentationAndSlides(
             presentation=presentation, slides=slide_sql_models
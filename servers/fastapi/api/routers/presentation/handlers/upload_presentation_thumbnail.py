@@ -7,7 +7,7 @@ from api.routers.presentation.models import PresentationAndPath
 from api.services.logging import LoggingService
 from api.services.instances import TEMP_FILE_SERVICE
 from api.sql_models import PresentationSqlModel
-from api.services.database import get_sql_session
+from api.services.database import get_async_sql_session
 from api.utils.utils import get_presentation_dir
 
 
@@ -36,8 +36,10 @@ class UploadPresentationThumbnailHandler:
             extra=log_metadata.model_dump(),
         )
 
-        with get_sql_session() as sql_session:
-            presentation = sql_session.get(PresentationSqlModel, self.presentation_id)
+        async with get_async_sql_session() as sql_session:
+            presentation = await sql_session.get(
+                PresentationSqlModel, self.presentation_id
+            )
 
             with open(os.path.join(self.presentation_dir, "thumbnail.jpg"), "wb") as f:
                 f.write(await self.thumbnail.read())
@@ -45,8 +47,8 @@ class UploadPresentationThumbnailHandler:
             presentation.thumbnail = os.path.join(
                 self.presentation_dir, "thumbnail.jpg"
             )
-            sql_session.commit()
-            sql_session.refresh(presentation)
+            await sql_session.commit()
+            await sql_session.refresh(presentation)
 
         response = PresentationAndPath(
             presentation_id=self.presentation_id, path=presentation.thumbnail
@@ -1,7 +1,7 @@
 import asyncio
-from typing import List
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
 
-from api.models import SSEStatusResponse
+from api.models import SSEAssetResponse, SSEStatusResponse
 from api.utils.utils import get_presentation_images_dir
 from image_processor.icons_finder import get_icon
 from image_processor.icons_vectorstore_utils import get_icons_vectorstore
@@ -9,50 +9,128 @@ from image_processor.images_finder import generate_image
 from ppt_generator.models.slide_model import SlideModel
 from ppt_generator.slide_model_utils import SlideModelUtils
 
+# Asset type, index among the assets of that type in the slide and the task
+# resolving to the asset path
+SlideAssetTask = Tuple[str, int, asyncio.Task]
+
 
 class FetchAssetsOnPresentationGenerationMixin:
 
-    async def fetch_slide_assets(self, slide_models: List[SlideModel]):
-        image_prompts = []
-        icon_queries = []
+    def get_icon_vector_store(self):
+        # Loaded once per handler, by the first slide with icons
+        if not hasattr(self, "_icon_vector_store"):
+            self._icon_vector_store = get_icons_vectorstore()
+        return self._icon_vector_store
 
-        for each_slide_model in slide_models:
-            slide_model_utils = SlideModelUtils(self.theme, each_slide_model)
-            image_prompts.extend(slide_model_utils.get_image_prompts())
-            icon_queries.extend(slide_model_utils.get_icon_queries())
+    def start_slide_assets(self, slide_model: SlideModel) -> List[SlideAssetTask]:
+        # Assets of a slide can be fetched while later slides are still generated
+        slide_model_utils = SlideModelUtils(self.theme, slide_model)
+        image_prompts = slide_model_utils.get_image_prompts()
+        icon_queries = slide_model_utils.get_icon_queries()
 
         if icon_queries:
-            icon_vector_store = get_icons_vectorstore()
+            icon_vector_store = self.get_icon_vector_store()
 
         images_directory = get_presentation_images_dir(self.presentation_id)
 
-        coroutines = [
-            generate_image(
-                each,
-                images_directory,
+        return [
+            (
+                "image",
+                index,
+                asyncio.create_task(generate_image(each, images_directory)),
             )
-            for each in image_prompts
-        ] + [get_icon(icon_vector_store, each) for each in icon_queries]
-
-        assets_future = asyncio.gather(*coroutines)
-
-        while not assets_future.done():
-            status = SSEStatusResponse(status="Fetching slide assets").to_string()
-            yield status
-            await asyncio.sleep(5)
-
-        assets = await assets_future
-
-        image_prompts_len = len(image_prompts)
-
-        images = assets[:image_prompts_len]
-        icons = assets[image_prompts_len:]
+            for index, each in enumerate(image_prompts)
+        ] + [
+            ("icon", index, asyncio.create_task(get_icon(icon_vector_store, each)))
+            for index, each in enumerate(icon_queries)
+        ]
+
+    def get_asset_response(
+        self, slide_index: int, asset_type: str, index: int, task: asyncio.Task
+    ) -> str:
+        return SSEAssetResponse(
+            slide=slide_index, asset_type=asset_type, index=index, path=task.result()
+        ).to_string()
+
+    def get_pending_assets(
+        self,
+        assets_tasks: Dict[int, List[SlideAssetTask]],
+        reported_tasks: Set[asyncio.Task],
+    ) -> Dict[asyncio.Task, Tuple[int, str, int]]:
+        return {
+            task: (slide_index, asset_type, index)
+            for slide_index, slide_assets in assets_tasks.items()
+            for asset_type, index, task in slide_assets
+            if task not in reported_tasks
+        }
+
+    async def stream_slide_assets(
+        self,
+        events: AsyncGenerator[str, None],
+        assets_tasks: Dict[int, List[SlideAssetTask]],
+        reported_tasks: Set[asyncio.Task],
+    ):
+        # Assets started by generated slides are reported as soon as they
+        # resolve, while the next events of the generation are awaited
+        next_event = asyncio.ensure_future(anext(events))
+        try:
+            while True:
+                pending = self.get_pending_assets(assets_tasks, reported_tasks)
+                done, _ = await asyncio.wait(
+                    [next_event, *pending], return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_event in done:
+                    try:
+                        event = next_event.result()
+                    except StopAsyncIteration:
+                        break
+                    yield event
+                    next_event = asyncio.ensure_future(anext(events))
+
+                for task in done:
+                    if task in pending:
+                        reported_tasks.add(task)
+                        yield self.get_asset_response(*pending[task], task)
+        finally:
+            # Generation is closed once no step of it is running anymore
+            if not next_event.done():
+                next_event.cancel()
+                await asyncio.wait([next_event])
+            await events.aclose()
+
+    async def fetch_slide_assets(
+        self,
+        slide_models: List[SlideModel],
+        assets_tasks: Optional[Dict[int, List[SlideAssetTask]]] = None,
+        reported_tasks: Optional[Set[asyncio.Task]] = None,
+    ):
+        # Slides whose assets were not started during generation start now
+        assets_tasks = {} if assets_tasks is None else assets_tasks
+        reported_tasks = set() if reported_tasks is None else reported_tasks
+        for each_slide_model in slide_models:
+            if each_slide_model.index not in assets_tasks:
+                assets_tasks[each_slide_model.index] = self.start_slide_assets(
+                    each_slide_model
+                )
+
+        pending = self.get_pending_assets(assets_tasks, reported_tasks)
+        if pending:
+            yield SSEStatusResponse(status="Fetching slide assets").to_string()
+
+        # Every asset is reported as soon as it resolves
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                reported_tasks.add(task)
+                yield self.get_asset_response(*pending.pop(task), task)
 
         for each_slide_model in slide_models:
+            slide_assets = assets_tasks[each_slide_model.index]
+            images = [
+                task.result() for each, _, task in slide_assets if each == "image"
+            ]
+            icons = [task.result() for each, _, task in slide_assets if each == "icon"]
             each_slide_model.images = images[: each_slide_model.images_count]
-            images = images[each_slide_model.images_count :]
-
             each_slide_model.icons = icons[: each_slide_model.icons_count]
-            icons = icons[each_slide_model.icons_count :]
 
         yield SSEStatusResponse(status="Slide assets fetched").to_string()
@@ -6,7 +6,10 @@ from pydantic import BaseModel, Field
 
 from api.models import OllamaModelMetadata
 from ppt_config_generator.models import SlideMarkdownModel
-from ppt_generator.models.pptx_models import PptxPresentationModel
+from ppt_generator.models.pptx_models import (
+    PptxImagesReportModel,
+    PptxPresentationModel,
+)
 from ppt_generator.models.query_and_prompt_models import (
     IconCategoryEnum,
     ImagePromptWithThemeAndAspectRatio,
@@ -144,6 +147,10 @@ class PresentationAndPath(BaseModel):
     path: str
 
 
+class PresentationPptxExport(PresentationAndPath):
+    images: PptxImagesReportModel
+
+
 class PresentationAndPaths(BaseModel):
     presentation_id: str
     paths: List[str]
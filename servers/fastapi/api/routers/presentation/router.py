@@ -1,6 +1,6 @@
 from typing import Annotated, List, Optional
 import uuid
-from fastapi import APIRouter, BackgroundTasks, Body, File, Form, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Body, File, Form, Query, UploadFile
 
 from api.models import SessionModel
 from api.request_utils import RequestUtils
@@ -74,6 +74,7 @@ from api.routers.presentation.models import (
     PresentationAndPath,
     PresentationAndPaths,
     PresentationAndSlides,
+    PresentationPptxExport,
     GenerateOutlinesRequest,
     PresentationAndUrls,
     PresentationGenerateRequest,
@@ -95,11 +96,14 @@ presentation_router = APIRouter(prefix=route_prefix)
 @presentation_router.get(
     "/user_presentations", response_model=List[PresentationWithOneSlide]
 )
-async def get_user_presentations():
+async def get_user_presentations(
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+    after: Optional[str] = None,
+):
     request_utils = RequestUtils(f"{route_prefix}/user_presentations")
     logging_service, log_metadata = await request_utils.initialize_logger()
     return await handle_errors(
-        GetPresentationsHandler().get, logging_service, log_metadata
+        GetPresentationsHandler(limit, after).get, logging_service, log_metadata
     )
 
 
@@ -306,7 +310,7 @@ async def search_icon(data: SearchIconRequest):
 
 
 @presentation_router.post(
-    "/presentation/export_as_pptx", response_model=PresentationAndPath
+    "/presentation/export_as_pptx", response_model=PresentationPptxExport
 )
 async def export_as_pptx(data: ExportAsRequest):
     request_utils = RequestUtils(f"{route_prefix}/presentation/export_as_pptx")
@@ -318,6 +322,20 @@ async def export_as_pptx(data: ExportAsRequest):
     )
 
 
+@presentation_router.post("/presentation/export_as_pptx/stream")
+async def export_as_pptx_stream(data: ExportAsRequest, persist: bool = False):
+    request_utils = RequestUtils(f"{route_prefix}/presentation/export_as_pptx/stream")
+    logging_service, log_metadata = await request_utils.initialize_logger(
+        presentation_id=data.presentation_id,
+    )
+    return await handle_errors(
+        ExportAsPptxHandler(data).stream,
+        logging_service,
+        log_metadata,
+        persist=persist,
+    )
+
+
 @presentation_router.delete("/delete", status_code=204)
 async def delete_presentation(presentation_id: str):
     request_utils = RequestUtils(f"{route_prefix}/delete")
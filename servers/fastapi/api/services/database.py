@@ -1,17 +1,89 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 import os
-from sqlalchemy import create_engine
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.utils.utils import get_resource
 
 
 database_url = os.getenv("DATABASE_URL") or "sqlite:///" + os.path.join(
     os.getenv("APP_DATA_DIRECTORY"), "fastapi.db"
 )
+is_sqlite = database_url.startswith("sqlite")
+
 connect_args = {}
-if "sqlite" in database_url:
+engine_options = {}
+if is_sqlite:
     connect_args["check_same_thread"] = False
+else:
+    engine_options = {
+        "pool_size": int(os.getenv("DATABASE_POOL_SIZE") or 10),
+        "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW") or 20),
+        "pool_timeout": float(os.getenv("DATABASE_POOL_TIMEOUT") or 30),
+        "pool_recycle": int(os.getenv("DATABASE_POOL_RECYCLE") or 1800),
+        "pool_pre_ping": os.getenv("DATABASE_POOL_PRE_PING") != "false",
+    }
+
+# WAL lets readers run alongside the single writer instead of
+# failing with "database is locked" while a generation is saved
+sqlite_pragmas = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE") or "WAL",
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS") or "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS") or 5000),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE") or 268435456),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE") or -64000),
+}
+
+
+def set_sqlite_pragmas(dbapi_connection, _):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in sqlite_pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+sql_engine = create_engine(database_url, connect_args=connect_args, **engine_options)
+if is_sqlite:
+    event.listen(sql_engine, "connect", set_sqlite_pragmas)
+
+# "async" uses an asyncio driver, "sync" runs the blocking engine above
+database_session_mode = os.getenv("DATABASE_SESSION_MODE") or "async"
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+_async_sql_engine: Optional[AsyncEngine] = None
+
+
+def get_async_database_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver available for {dialect} databases")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
 
-sql_engine = create_engine(database_url, connect_args=connect_args)
+def get_async_sql_engine() -> AsyncEngine:
+    global _async_sql_engine
+    if _async_sql_engine is None:
+        _async_sql_engine = create_async_engine(
+            get_async_database_url(database_url),
+            connect_args=connect_args,
+            **engine_options,
+        )
+        if is_sqlite:
+            event.listen(_async_sql_engine.sync_engine, "connect", set_sqlite_pragmas)
+    return _async_sql_engine
 
 
 @contextmanager
@@ -21,3 +93,54 @@ def get_sql_session():
         yield session
     finally:
         session.close()
+
+
+class SyncSessionAdapter:
+    """
+    Exposes a blocking Session with the awaitable interface of AsyncSession,
+    so handlers are written once for both session modes.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    def add_all(self, instances):
+        self.session.add_all(instances)
+
+    async def get(self, *args, **kwargs):
+        return self.session.get(*args, **kwargs)
+
+    async def exec(self, *args, **kwargs):
+        return self.session.exec(*args, **kwargs)
+
+    async def delete(self, instance):
+        self.session.delete(instance)
+
+    async def commit(self):
+        self.session.commit()
+
+    async def refresh(self, instance):
+        self.session.refresh(instance)
+
+
+@asynccontextmanager
+async def get_async_sql_session():
+    if database_session_mode == "sync":
+        with Session(sql_engine, expire_on_commit=False) as session:
+            yield SyncSessionAdapter(session)
+    else:
+        async with AsyncSession(
+            get_async_sql_engine(), expire_on_commit=False
+        ) as session:
+            yield session
+
+
+def migrate_database():
+    alembic_config = Config()
+    alembic_config.set_main_option("script_location", get_resource("migrations"))
+    with sql_engine.begin() as connection:
+        alembic_config.attributes["connection"] = connection
+        command.upgrade(alembic_config, "head")
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Optional
+
+
+class DiskCacheService:
+    """
+    Content-addressed file cache stored under APP_DATA_DIRECTORY/cache/<name>.
+    Keys point to blobs named by the sha256 of their content, so identical
+    files are stored once. Least recently used blobs are evicted once the
+    cache grows above max_size bytes.
+    """
+
+    # Blobs being written by put_bytes before they are renamed in place
+    TEMP_SUFFIX = ".tmp"
+
+    def __init__(self, name: str, max_size: int, ttl: Optional[float] = None):
+        self.cache_dir = os.path.join(os.getenv("APP_DATA_DIRECTORY"), "cache", name)
+        self.keys_dir = os.path.join(self.cache_dir, "keys")
+        self.blobs_dir = os.path.join(self.cache_dir, "blobs")
+        self.max_size = max_size
+        self.ttl = ttl
+
+        # Size of the blobs as of the last scan plus the blobs put since,
+        # blobs are only scanned again once it grows above max_size
+        self._size: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def get_key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def get_key_path(self, key: str) -> str:
+        return os.path.join(self.keys_dir, key)
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        key_path = self.get_key_path(key)
+        try:
+            if self.ttl and time.time() - os.path.getmtime(key_path) > self.ttl:
+                os.remove(key_path)
+                return None
+            with open(key_path, "r") as f:
+                blob_path = os.path.join(self.blobs_dir, f.read())
+        except OSError:
+            return None
+
+        try:
+            # Blob mtime is the last access time used for eviction
+            os.utime(blob_path)
+        except OSError:
+            # Keys of evicted blobs are dropped on their first miss
+            try:
+                os.remove(key_path)
+            except OSError:
+                pass
+            return None
+        return blob_path
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        blob_path = self.get(key)
+        if not blob_path:
+            return None
+        try:
+            with open(blob_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def copy_to(self, key: str, output_path: str) -> bool:
+        blob_path = self.get(key)
+        if not blob_path:
+            return False
+        try:
+            shutil.copyfile(blob_path, output_path)
+        except OSError:
+            return False
+        return True
+
+    def put_bytes(self, key: str, content: bytes, extension: str = "") -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        os.makedirs(self.keys_dir, exist_ok=True)
+        os.makedirs(self.blobs_dir, exist_ok=True)
+
+        blob_name = hashlib.sha256(content).hexdigest() + extension
+        blob_path = os.path.join(self.blobs_dir, blob_name)
+        if os.path.exists(blob_path):
+            os.utime(blob_path)
+        else:
+            self._write_atomic(blob_path, content)
+            if self._size is not None:
+                self._size += len(content)
+        self._write_atomic(self.get_key_path(key), blob_name.encode())
+
+        if self._size is None or self._size > self.max_size:
+            self.evict()
+        return blob_path
+
+    def put_file(self, key: str, file_path: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        with open(file_path, "rb") as f:
+            content = f.read()
+        return self.put_bytes(key, content, os.path.splitext(file_path)[1])
+
+    def evict(self):
+        blobs = []
+        total_size = 0
+        with os.scandir(self.blobs_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.TEMP_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Removed by a concurrent eviction
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        # Keys of evicted blobs are dropped when they miss in get()
+        if total_size > self.max_size:
+            for _, size, path in sorted(blobs):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+        self._size = total_size
+
+    def _write_atomic(self, path: str, content: bytes):
+        temp_path = f"{path}.{uuid.uuid4()}{self.TEMP_SUFFIX}"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
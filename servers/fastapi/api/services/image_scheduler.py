@@ -0,0 +1,129 @@
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = {"openai": 4, "google": 4, "pexels": 8}
+
+
+def get_rate_limit_delay(error: Exception) -> Optional[float]:
+    """
+    Returns the delay requested by a 429 error, 0 if the provider did not ask
+    for one and None if the error is not a rate limit error.
+    Works with openai, google-genai and aiohttp errors.
+    """
+    status = None
+    for attribute in ["status_code", "status", "code"]:
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            status = value
+            break
+    if status != 429:
+        return None
+
+    headers = getattr(error, "headers", None)
+    response = getattr(error, "response", None)
+    if headers is None and response is not None:
+        headers = getattr(response, "headers", None)
+
+    try:
+        return max(float(headers.get("retry-after")), 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+class ProviderLimiter:
+    """
+    Concurrency cap, token bucket and shared 429 pause of one image provider.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: float):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.rate = requests_per_minute / 60
+        self.capacity = self.max_concurrency
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def take_token(self) -> float:
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if not self.rate:
+            return 0
+
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    async def wait_for_turn(self):
+        while True:
+            delay = self.take_token()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+
+class ImageSchedulerService:
+    """
+    Process-wide scheduler for image provider calls.
+    All presentations share the limits of a provider, and a 429 pauses
+    every pending call to that provider instead of only the failing one.
+    """
+
+    def __init__(self):
+        self.max_retries = int(os.getenv("IMAGE_MAX_RETRIES") or 3)
+        self.backoff = float(os.getenv("IMAGE_RETRY_BACKOFF") or 2)
+        self.limiters: Dict[str, ProviderLimiter] = {}
+
+    def get_limiter(self, provider: str) -> ProviderLimiter:
+        if provider not in self.limiters:
+            env_prefix = provider.upper()
+            max_concurrency = os.getenv(f"{env_prefix}_IMAGE_MAX_CONCURRENCY")
+            requests_per_minute = os.getenv(f"{env_prefix}_IMAGE_REQUESTS_PER_MINUTE")
+            self.limiters[provider] = ProviderLimiter(
+                int(max_concurrency or DEFAULT_MAX_CONCURRENCY.get(provider, 4)),
+                float(requests_per_minute or 0),
+            )
+        return self.limiters[provider]
+
+    async def run(
+        self, provider: str, func: Callable[..., Awaitable[T]], *args, **kwargs
+    ) -> T:
+        limiter = self.get_limiter(provider)
+        attempt = 0
+        while True:
+            async with limiter.get_semaphore():
+                await limiter.wait_for_turn()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    delay = get_rate_limit_delay(e)
+                    if delay is None or attempt >= self.max_retries:
+                        raise
+                    if not delay:
+                        delay = self.backoff * 2**attempt * random.uniform(1, 1.5)
+                    print(f"Rate limited by {provider}, retrying in {delay:.1f}s")
+                    limiter.pause(delay)
+                    attempt += 1
@@ -1,6 +1,39 @@
+import os
+
+from api.services.disk_cache import DiskCacheService
+from api.services.image_scheduler import ImageSchedulerService
+from api.services.llm_client import LLMClientService
+from api.services.process_pool import ProcessPoolService
 from api.services.redis import RedisService
 from api.services.temp_file import TempFileService
+from api.services.user_config import UserConfigService
 
 
 TEMP_FILE_SERVICE = TempFileService()
 REDIS_SERVICE = RedisService()
+LLM_CLIENT_SERVICE = LLMClientService()
+USER_CONFIG_SERVICE = UserConfigService(
+    LLM_CLIENT_SERVICE, watch_file=os.getenv("CAN_CHANGE_KEYS") != "false"
+)
+IMAGE_CACHE_SERVICE = DiskCacheService(
+    "images", max_size=int(os.getenv("IMAGE_CACHE_MAX_SIZE_MB") or 1024) * 1024 * 1024
+)
+IMAGE_SCHEDULER_SERVICE = ImageSchedulerService()
+PROCESS_POOL_SERVICE = ProcessPoolService()
+PICTURE_CACHE_SERVICE = DiskCacheService(
+    "pictures",
+    max_size=int(os.getenv("PICTURE_CACHE_MAX_SIZE_MB") or 512) * 1024 * 1024,
+)
+SLIDE_CACHE_SERVICE = DiskCacheService(
+    "slides",
+    max_size=int(os.getenv("SLIDE_CACHE_MAX_SIZE_MB") or 256) * 1024 * 1024,
+)
+DOCUMENT_CACHE_SERVICE = DiskCacheService(
+    "documents",
+    max_size=int(os.getenv("DOCUMENT_CACHE_MAX_SIZE_MB") or 1024) * 1024 * 1024,
+)
+SUMMARY_CACHE_SERVICE = DiskCacheService(
+    "summaries",
+    max_size=int(os.getenv("SUMMARY_CACHE_MAX_SIZE_MB") or 64) * 1024 * 1024,
+    ttl=float(os.getenv("SUMMARY_CACHE_TTL_HOURS") or 168) * 60 * 60,
+)
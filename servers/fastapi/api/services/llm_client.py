@@ -0,0 +1,150 @@
+import asyncio
+import os
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+class _TrackedByteStream(httpx.AsyncByteStream):
+    # Response bodies are read after the transport returns, the request is
+    # only finished once its stream is closed
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self.stream = stream
+        self.on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            on_close, self.on_close = self.on_close, None
+            if on_close:
+                on_close()
+
+
+class _TrackedTransport(httpx.AsyncHTTPTransport):
+    """
+    Transport counting the requests in flight, so a client can be closed as
+    soon as the ones already sent through it are done.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def _finish_request(self):
+        self.in_flight -= 1
+        if not self.in_flight:
+            self.idle.set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.idle.clear()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self._finish_request()
+            raise
+        response.stream = _TrackedByteStream(response.stream, self._finish_request)
+        return response
+
+
+ClientEntry = Tuple[AsyncOpenAI, _TrackedTransport, Optional[asyncio.AbstractEventLoop]]
+
+
+class LLMClientService:
+    """
+    Process-wide registry of AsyncOpenAI clients keyed by (base_url, api_key).
+    Reusing a client keeps its httpx connection pool and keep-alive connections.
+    """
+
+    def __init__(self):
+        self.max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = int(
+            os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20")
+        )
+        self.keepalive_expiry = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+
+        self._clients: Dict[Tuple[str, str], ClientEntry] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def _create_client(
+        self, base_url: str, api_key: str
+    ) -> Tuple[AsyncOpenAI, _TrackedTransport]:
+        transport = _TrackedTransport(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+        )
+        client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(transport=transport),
+        )
+        return client, transport
+
+    def get_client(self, base_url: str, api_key: str) -> AsyncOpenAI:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        key = (base_url, api_key)
+        entry = self._clients.get(key)
+        # Pooled connections can not be shared across event loops
+        if entry and entry[2] is loop:
+            return entry[0]
+        if entry:
+            self._retire(entry)
+
+        client, transport = self._create_client(base_url, api_key)
+        self._clients[key] = (client, transport, loop)
+        return client
+
+    async def _close_when_idle(self, client: AsyncOpenAI, transport: _TrackedTransport):
+        await transport.idle.wait()
+        await client.close()
+
+    def _start_closing(self, client: AsyncOpenAI, transport: _TrackedTransport):
+        task = asyncio.get_running_loop().create_task(
+            self._close_when_idle(client, transport)
+        )
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _retire(self, entry: ClientEntry):
+        # Clients are closed on the loop owning their connections once their
+        # requests in flight finish, connections of closed loops are already gone
+        client, transport, loop = entry
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is running_loop:
+            self._start_closing(client, transport)
+        else:
+            loop.call_soon_threadsafe(self._start_closing, client, transport)
+
+    def clear(self):
+        # Requests in flight keep using their client until they finish
+        clients, self._clients = self._clients, {}
+        for entry in clients.values():
+            self._retire(entry)
+
+    async def aclose(self):
+        # Waits for the clients of the running loop to be closed
+        self.clear()
+        loop = asyncio.get_running_loop()
+        closing = [task for task in self._closing if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
@@ -0,0 +1,52 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ProcessPoolService:
+    """
+    Shared pool of worker processes for CPU bound work like image processing.
+    Workers are spawned, so functions run in the pool must live in modules
+    that are cheap to import and do not import api.services.instances.
+    With PROCESS_POOL_WORKERS=0 functions run in a thread instead.
+    """
+
+    def __init__(self):
+        max_workers = os.getenv("PROCESS_POOL_WORKERS")
+        self.max_workers = (
+            int(max_workers) if max_workers else min(os.cpu_count() or 1, 4)
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.get_executor(), functools.partial(func, *args, **kwargs)
+            )
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool, start a new one for next calls
+            self.shutdown()
+            raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,117 @@
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from api.models import UserConfig
+from api.services.llm_client import LLMClientService
+
+LLM_CREDENTIAL_KEYS = [
+    "LLM",
+    "OPENAI_API_KEY",
+    "GOOGLE_API_KEY",
+    "OLLAMA_URL",
+    "CUSTOM_LLM_URL",
+    "CUSTOM_LLM_API_KEY",
+]
+
+
+class UserConfigService:
+    """
+    Keeps an immutable snapshot of the user config in memory.
+    The config file is only re-read when its mtime, inode or size changes,
+    and only read once if it is not watched. The environment is compared on
+    every refresh.
+    """
+
+    def __init__(self, llm_client_service: LLMClientService, watch_file: bool):
+        self.user_config_path = os.getenv("USER_CONFIG_PATH")
+        self.watch_file = watch_file
+        self.llm_client_service = llm_client_service
+
+        # Values set in the environment by anything but publish
+        self._env_config = UserConfig()
+        self._config: Optional[UserConfig] = None
+        self._file_signature: Optional[Tuple[int, int, int]] = None
+        self._file_config = UserConfig()
+        # Values publish wrote over those of the environment, by key
+        self._published_env: Dict[str, Optional[str]] = {}
+
+    @property
+    def config(self) -> UserConfig:
+        if self._config is None:
+            self.refresh(force=True)
+        return self._config
+
+    def get_file_signature(self) -> Optional[Tuple[int, int, int]]:
+        if not self.user_config_path:
+            return None
+        if not self.watch_file and self._config is not None:
+            return self._file_signature
+        try:
+            stat = os.stat(self.user_config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        file_signature = self.get_file_signature()
+        file_changed = file_signature != self._file_signature
+        env_config = self.load_env()
+        if not force and not file_changed and env_config == self._env_config:
+            return False
+
+        if file_changed or self._config is None:
+            self._file_signature = file_signature
+            self._file_config = self.load_file()
+        self._env_config = env_config
+        self.publish(self.load())
+        return True
+
+    def load_env(self) -> UserConfig:
+        env_config = {}
+        for key in UserConfig.model_fields:
+            value = os.getenv(key)
+            # Keys still holding what publish wrote keep their environment value
+            if key in self._published_env and value == self._published_env[key]:
+                value = getattr(self._env_config, key)
+            env_config[key] = value
+        return UserConfig(**env_config)
+
+    def load_file(self) -> UserConfig:
+        if not self._file_signature:
+            return UserConfig()
+        try:
+            with open(self.user_config_path, "r") as f:
+                return UserConfig(**json.load(f))
+        except Exception:
+            print("Error while loading user config")
+            return UserConfig()
+
+    def load(self) -> UserConfig:
+        return UserConfig(
+            **{
+                key: getattr(self._file_config, key) or getattr(self._env_config, key)
+                for key in UserConfig.model_fields
+            }
+        )
+
+    def publish(self, user_config: UserConfig):
+        old_config = self._config
+        self._config = user_config
+
+        # Keeps environment in sync for SDKs that read their keys from it
+        self._published_env = {}
+        for key in UserConfig.model_fields:
+            value = getattr(user_config, key) or None
+            if value:
+                os.environ[key] = value
+            else:
+                os.environ.pop(key, None)
+            if value != getattr(self._env_config, key):
+                self._published_env[key] = value
+
+        if old_config and any(
+            getattr(old_config, key) != getattr(user_config, key)
+            for key in LLM_CREDENTIAL_KEYS
+        ):
+            self.llm_client_service.clear()
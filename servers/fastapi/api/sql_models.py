@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 import uuid
-from sqlmodel import SQLModel, Field, Column, JSON
+from sqlmodel import SQLModel, Field, Column, Index, JSON
 
 
 def get_random_uuid() -> str:
@@ -10,7 +10,7 @@ def get_random_uuid() -> str:
 
 class PresentationSqlModel(SQLModel, table=True):
     id: str = Field(default_factory=get_random_uuid, primary_key=True)
-    created_at: datetime = Field(default=datetime.now())
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
     prompt: Optional[str] = None
     n_slides: int
     theme: Optional[dict] = Field(sa_column=Column(JSON, nullable=True), default=None)
@@ -32,6 +32,10 @@ class PresentationSqlModel(SQLModel, table=True):
 
 
 class SlideSqlModel(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_slidesqlmodel_presentation_index", "presentation", "index"),
+    )
+
     id: str = Field(default_factory=get_random_uuid, primary_key=True)
     index: int = Field(index=True)
     type: int
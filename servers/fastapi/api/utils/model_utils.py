@@ -8,6 +8,7 @@ from openai import AsyncOpenAI
 import openai
 
 from api.models import SelectedLLMProvider
+from api.services.instances import LLM_CLIENT_SERVICE, USER_CONFIG_SERVICE
 from api.routers.presentation.models import OllamaModelStatusResponse
 
 
@@ -20,8 +21,9 @@ def is_custom_llm_selected() -> bool:
 
 
 def get_llm_provider_url_or():
+    user_config = USER_CONFIG_SERVICE.config
     llm_provider_url = (
-        os.getenv("OLLAMA_URL") if is_ollama_selected() else os.getenv("CUSTOM_LLM_URL")
+        user_config.OLLAMA_URL if is_ollama_selected() else user_config.CUSTOM_LLM_URL
     )
     llm_provider_url = llm_provider_url or "http://localhost:11434"
     if llm_provider_url.endswith("/"):
@@ -30,7 +32,7 @@ def get_llm_provider_url_or():
 
 
 def get_selected_llm_provider() -> SelectedLLMProvider:
-    return SelectedLLMProvider(os.getenv("LLM"))
+    return SelectedLLMProvider(USER_CONFIG_SERVICE.config.LLM)
 
 
 async def list_available_custom_models(
@@ -65,23 +67,36 @@ def get_model_base_url():
 def get_llm_api_key():
     selected_llm = get_selected_llm_provider()
     if selected_llm == SelectedLLMProvider.OPENAI:
-        return os.getenv("OPENAI_API_KEY")
+        return USER_CONFIG_SERVICE.config.OPENAI_API_KEY
     elif selected_llm == SelectedLLMProvider.GOOGLE:
-        return os.getenv("GOOGLE_API_KEY")
+        return USER_CONFIG_SERVICE.config.GOOGLE_API_KEY
     elif selected_llm == SelectedLLMProvider.OLLAMA:
         return "ollama"
     elif selected_llm == SelectedLLMProvider.CUSTOM:
-        return os.getenv("CUSTOM_LLM_API_KEY") or "null"
+        return USER_CONFIG_SERVICE.config.CUSTOM_LLM_API_KEY or "null"
     else:
         raise ValueError(f"Invalid LLM API key")
 
 
-def get_llm_client():
-    client = AsyncOpenAI(
-        base_url=get_model_base_url(),
-        api_key=get_llm_api_key(),
-    )
-    return client
+def get_llm_client() -> AsyncOpenAI:
+    return LLM_CLIENT_SERVICE.get_client(get_model_base_url(), get_llm_api_key())
+
+
+def get_llm_concurrency() -> int:
+    selected_llm = get_selected_llm_provider()
+    if selected_llm == SelectedLLMProvider.OLLAMA:
+        env_name, default = "OLLAMA_CONCURRENCY", 1
+    elif selected_llm == SelectedLLMProvider.CUSTOM:
+        env_name, default = "CUSTOM_LLM_CONCURRENCY", 4
+    else:
+        return 1
+
+    concurrency = os.getenv(env_name)
+    try:
+        return max(int(concurrency or default), 1)
+    except ValueError:
+        print(f"Warning: invalid {env_name} {concurrency!r}, using {default}")
+        return default
 
 
 def get_large_model():
@@ -91,9 +106,9 @@ def get_large_model():
     elif selected_llm == SelectedLLMProvider.GOOGLE:
         return "gemini-2.0-flash"
     elif selected_llm == SelectedLLMProvider.OLLAMA:
-        return os.getenv("OLLAMA_MODEL")
+        return USER_CONFIG_SERVICE.config.OLLAMA_MODEL
     elif selected_llm == SelectedLLMProvider.CUSTOM:
-        return os.getenv("CUSTOM_MODEL")
+        return USER_CONFIG_SERVICE.config.CUSTOM_MODEL
     else:
         raise ValueError(f"Invalid LLM model")
 
@@ -105,9 +120,9 @@ def get_small_model():
     elif selected_llm == SelectedLLMProvider.GOOGLE:
         return "gemini-2.0-flash"
     elif selected_llm == SelectedLLMProvider.OLLAMA:
-        return os.getenv("OLLAMA_MODEL")
+        return USER_CONFIG_SERVICE.config.OLLAMA_MODEL
     elif selected_llm == SelectedLLMProvider.CUSTOM:
-        return os.getenv("CUSTOM_MODEL")
+        return USER_CONFIG_SERVICE.config.CUSTOM_MODEL
     else:
         raise ValueError(f"Invalid LLM model")
 
@@ -119,9 +134,9 @@ def get_nano_model():
     elif selected_llm == SelectedLLMProvider.GOOGLE:
         return "gemini-2.0-flash"
     elif selected_llm == SelectedLLMProvider.OLLAMA:
-        return os.getenv("OLLAMA_MODEL")
+        return USER_CONFIG_SERVICE.config.OLLAMA_MODEL
     elif selected_llm == SelectedLLMProvider.CUSTOM:
-        return os.getenv("CUSTOM_MODEL")
+        return USER_CONFIG_SERVICE.config.CUSTOM_MODEL
     else:
         raise ValueError(f"Invalid LLM model")
 
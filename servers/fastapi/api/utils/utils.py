@@ -1,4 +1,6 @@
 import asyncio
+from functools import lru_cache
+import hashlib
 import json
 import os
 import sys
@@ -11,6 +13,7 @@ from fastapi import HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 
 from api.models import LogMetadata, UserConfig
+from api.services.instances import USER_CONFIG_SERVICE
 from api.services.logging import LoggingService
 
 
@@ -28,52 +31,27 @@ def get_presentation_images_dir(presentation_id: str) -> str:
     return presentation_images_dir
 
 
-def get_user_config():
-    user_config_path = os.getenv("USER_CONFIG_PATH")
+@lru_cache(maxsize=4096)
+def _get_file_hash(file_path: str, mtime_ns: int, size: int) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
 
-    existing_config = UserConfig()
-    try:
-        if os.path.exists(user_config_path):
-            with open(user_config_path, "r") as f:
-                existing_config = UserConfig(**json.load(f))
-    except Exception as e:
-        print("Error while loading user config")
-        pass
-
-    return UserConfig(
-        LLM=existing_config.LLM or os.getenv("LLM"),
-        OPENAI_API_KEY=existing_config.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY"),
-        GOOGLE_API_KEY=existing_config.GOOGLE_API_KEY or os.getenv("GOOGLE_API_KEY"),
-        OLLAMA_URL=existing_config.OLLAMA_URL or os.getenv("OLLAMA_URL"),
-        OLLAMA_MODEL=existing_config.OLLAMA_MODEL or os.getenv("OLLAMA_MODEL"),
-        CUSTOM_LLM_URL=existing_config.CUSTOM_LLM_URL or os.getenv("CUSTOM_LLM_URL"),
-        CUSTOM_LLM_API_KEY=existing_config.CUSTOM_LLM_API_KEY
-        or os.getenv("CUSTOM_LLM_API_KEY"),
-        CUSTOM_MODEL=existing_config.CUSTOM_MODEL or os.getenv("CUSTOM_MODEL"),
-        PEXELS_API_KEY=existing_config.PEXELS_API_KEY or os.getenv("PEXELS_API_KEY"),
-    )
+
+def get_file_hash(file_path: str) -> str:
+    # Hashes are reused until the file is modified
+    stat = os.stat(file_path)
+    return _get_file_hash(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def get_user_config() -> UserConfig:
+    return USER_CONFIG_SERVICE.config
 
 
 def update_env_with_user_config():
-    user_config = get_user_config()
-    if user_config.LLM:
-        os.environ["LLM"] = user_config.LLM
-    if user_config.OPENAI_API_KEY:
-        os.environ["OPENAI_API_KEY"] = user_config.OPENAI_API_KEY
-    if user_config.GOOGLE_API_KEY:
-        os.environ["GOOGLE_API_KEY"] = user_config.GOOGLE_API_KEY
-    if user_config.OLLAMA_URL:
-        os.environ["OLLAMA_URL"] = user_config.OLLAMA_URL
-    if user_config.OLLAMA_MODEL:
-        os.environ["OLLAMA_MODEL"] = user_config.OLLAMA_MODEL
-    if user_config.CUSTOM_LLM_URL:
-        os.environ["CUSTOM_LLM_URL"] = user_config.CUSTOM_LLM_URL
-    if user_config.CUSTOM_LLM_API_KEY:
-        os.environ["CUSTOM_LLM_API_KEY"] = user_config.CUSTOM_LLM_API_KEY
-    if user_config.CUSTOM_MODEL:
-        os.environ["CUSTOM_MODEL"] = user_config.CUSTOM_MODEL
-    if user_config.PEXELS_API_KEY:
-        os.environ["PEXELS_API_KEY"] = user_config.PEXELS_API_KEY
+    USER_CONFIG_SERVICE.refresh()
 
 
 def get_resource(relative_path):
@@ -0,0 +1,96 @@
+"""
+Compares parse_markdown_text_to_text_runs with the rescanning parser it replaced
+on long bullet lists.
+
+    python -m benchmarks.parse_markdown
+"""
+
+import tempfile
+import timeit
+
+from ppt_generator.models.pptx_models import (
+    PptxFontModel,
+    PptxPresentationModel,
+    PptxTextRunModel,
+)
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+from ppt_generator.utils import tokenize_markdown_line
+
+
+def parse_markdown_rescanning(font: PptxFontModel, text: str):
+    # Loops forever on unmatched markers, only fed balanced markdown here
+    text_runs = []
+    for line in text.split("\n"):
+        current_pos = 0
+        while current_pos < len(line):
+            for marker, bold, italic in [
+                ("***", True, True),
+                ("**", True, False),
+                ("__", False, True),
+            ]:
+                if (
+                    line[current_pos:].startswith(marker)
+                    and marker in line[current_pos + len(marker) :]
+                ):
+                    end_pos = line.find(marker, current_pos + len(marker))
+                    font_json = font.model_dump()
+                    font_json["bold"] = font_json["bold"] or bold
+                    font_json["italic"] = font_json["italic"] or italic
+                    text_runs.append(
+                        PptxTextRunModel(
+                            text=line[current_pos + len(marker) : end_pos],
+                            font=PptxFontModel(**font_json),
+                        )
+                    )
+                    current_pos = end_pos + len(marker)
+                    break
+            else:
+                next_marker = float("inf")
+                for marker in ["***", "**", "__"]:
+                    pos = line.find(marker, current_pos)
+                    if pos != -1:
+                        next_marker = min(next_marker, pos)
+                end_pos = next_marker if next_marker != float("inf") else len(line)
+                if line[current_pos:end_pos]:
+                    text_runs.append(
+                        PptxTextRunModel(text=line[current_pos:end_pos], font=font)
+                    )
+                current_pos = end_pos
+
+        if line != text.split("\n")[-1]:
+            text_runs.append(PptxTextRunModel(text="\n"))
+
+    return text_runs
+
+
+def main():
+    font = PptxFontModel()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ppt_creator = PptxPresentationCreator(
+            PptxPresentationModel(background_color="ffffff", slides=[]), temp_dir
+        )
+
+        def parse_uncached(font: PptxFontModel, text: str):
+            tokenize_markdown_line.cache_clear()
+            return ppt_creator.parse_markdown_text_to_text_runs(font, text)
+
+        for n_bullets, words in [(20, 10), (200, 10), (20, 400)]:
+            text = "\n".join(
+                f"- **Point {i}** "
+                + " ".join(f"__word {j}__ plain" for j in range(words))
+                for i in range(n_bullets)
+            )
+            print(f"{n_bullets} bullets of {words} styled words")
+            for name, func in [
+                ("rescanning", parse_markdown_rescanning),
+                ("tokenizer", ppt_creator.parse_markdown_text_to_text_runs),
+                ("tokenizer, uncached lines", parse_uncached),
+            ]:
+                seconds = min(
+                    timeit.repeat(lambda: func(font, text), number=1, repeat=5)
+                )
+                print(f"  {name}: {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 import asyncio
+import json
+import math
 import mimetypes
 import os
-from typing import List, Tuple
+from typing import Awaitable, Callable, List, Optional, Tuple
 from fastapi import HTTPException
-from pptx import Presentation
-import pdfplumber
-from docx import Document as DocxDocument
-
+from api.services.instances import (
+    DOCUMENT_CACHE_SERVICE,
+    PROCESS_POOL_SERVICE,
+    TEMP_FILE_SERVICE,
+)
+from api.utils.utils import get_file_hash
+from document_processor.parsers import (
+    get_pdf_page_count,
+    load_msword,
+    load_pdf_pages,
+    load_powerpoint,
+)
 from image_processor.utils import get_page_images_from_pdf_async
 
 PDF_MIME_TYPES = ["application/pdf"]
@@ -23,6 +33,10 @@ UPLOAD_ACCEPTED_DOCUMENTS = (
     PDF_MIME_TYPES + TEXT_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
 )
 
+# Bump when the text or images extracted from documents change to invalidate
+# cached documents
+DOCUMENT_LOADER_VERSION = 1
+
 
 class DocumentsLoader:
 
@@ -46,35 +60,50 @@ class DocumentsLoader:
         load_text: bool = True,
         load_images: bool = False,
     ):
-        documents: List[str] = []
-        images: List[str] = []
-
         for file_path in self._document_paths:
             if not os.path.exists(file_path):
                 raise HTTPException(
                     status_code=404, detail=f"File {file_path} not found"
                 )
 
-            document = ""
-            imgs = []
+        # Documents load concurrently, gather keeps results in input order
+        results = await asyncio.gather(
+            *[
+                self.load_document(file_path, temp_dir, load_text, load_images)
+                for file_path in self._document_paths
+            ]
+        )
 
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
-
-            documents.append(document)
-            images.append(imgs)
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
-        self._documents = documents
-        self._images = images
+    async def load_document(
+        self,
+        file_path: str,
+        temp_dir: str,
+        load_text: bool,
+        load_images: bool,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_cached_text(
+                file_path, lambda: PROCESS_POOL_SERVICE.run(load_powerpoint, file_path)
+            )
+        elif mime_type in WORD_TYPES:
+            document = await self.load_cached_text(
+                file_path, lambda: PROCESS_POOL_SERVICE.run(load_msword, file_path)
+            )
+
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -87,34 +116,113 @@ class DocumentsLoader:
         document: str = ""
 
         if load_text:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    document += await asyncio.to_thread(page.extract_text)
+            document = await self.load_cached_text(
+                file_path, lambda: self.load_pdf_text(file_path)
+            )
 
         if load_images:
-            image_paths = await get_page_images_from_pdf_async(file_path, temp_dir)
+            image_paths = await self.load_pdf_images(file_path, temp_dir)
 
         return document, image_paths
 
+    def get_cache_key(self, kind: str, file_path: str) -> Optional[str]:
+        if not DOCUMENT_CACHE_SERVICE.enabled:
+            return None
+        return DOCUMENT_CACHE_SERVICE.get_key(
+            DOCUMENT_LOADER_VERSION, kind, get_file_hash(file_path)
+        )
+
+    async def load_cached_text(
+        self, file_path: str, load: Callable[[], Awaitable[str]]
+    ) -> str:
+        cache_key = await asyncio.to_thread(self.get_cache_key, "text", file_path)
+        if cache_key:
+            cached_text = await asyncio.to_thread(
+                DOCUMENT_CACHE_SERVICE.get_bytes, cache_key
+            )
+            if cached_text is not None:
+                return cached_text.decode()
+
+        document = await load()
+        if cache_key:
+            try:
+                await asyncio.to_thread(
+                    DOCUMENT_CACHE_SERVICE.put_bytes,
+                    cache_key,
+                    document.encode(),
+                    ".txt",
+                )
+            except OSError as e:
+                print(f"Could not cache document text: {e}")
+        return document
+
+    async def load_pdf_images(self, file_path: str, temp_dir: str) -> List[str]:
+        cache_key = await asyncio.to_thread(self.get_cache_key, "images", file_path)
+        if cache_key:
+            image_paths = await asyncio.to_thread(
+                self.copy_cached_images, cache_key, temp_dir
+            )
+            if image_paths is not None:
+                return image_paths
+
+        image_paths = await get_page_images_from_pdf_async(file_path, temp_dir)
+        if cache_key:
+            try:
+                await asyncio.to_thread(self.cache_images, cache_key, image_paths)
+            except OSError as e:
+                print(f"Could not cache document images: {e}")
+        return image_paths
+
+    def copy_cached_images(self, cache_key: str, temp_dir: str) -> Optional[List[str]]:
+        n_images = DOCUMENT_CACHE_SERVICE.get_bytes(cache_key)
+        if n_images is None:
+            return None
+
+        images_temp_dir = TEMP_FILE_SERVICE.create_dir_in_dir(temp_dir)
+        image_paths = []
+        for index in range(json.loads(n_images)):
+            image_path = os.path.join(images_temp_dir, f"page_{index + 1}.png")
+            image_key = DOCUMENT_CACHE_SERVICE.get_key(cache_key, index)
+            # Images of a document are rendered again if any page was evicted
+            if not DOCUMENT_CACHE_SERVICE.copy_to(image_key, image_path):
+                return None
+            image_paths.append(image_path)
+        return image_paths
+
+    def cache_images(self, cache_key: str, image_paths: List[str]):
+        for index, image_path in enumerate(image_paths):
+            DOCUMENT_CACHE_SERVICE.put_file(
+                DOCUMENT_CACHE_SERVICE.get_key(cache_key, index), image_path
+            )
+        DOCUMENT_CACHE_SERVICE.put_bytes(
+            cache_key, json.dumps(len(image_paths)).encode()
+        )
+
+    async def load_pdf_text(self, file_path: str) -> str:
+        # Page ranges are extracted in parallel in the process pool. Every shard
+        # walks the page tree again, so there is at most one shard per worker
+        n_pages = await PROCESS_POOL_SERVICE.run(get_pdf_page_count, file_path)
+        pages_per_shard = max(
+            int(os.getenv("PDF_PAGES_PER_SHARD") or 20),
+            math.ceil(n_pages / max(PROCESS_POOL_SERVICE.max_workers, 1)),
+            1,
+        )
+        shards = await asyncio.gather(
+            *[
+                PROCESS_POOL_SERVICE.run(
+                    load_pdf_pages,
+                    file_path,
+                    start,
+                    min(start + pages_per_shard, n_pages),
+                )
+                for start in range(0, n_pages, pages_per_shard)
+            ]
+        )
+        return "".join(shards)
+
     async def load_text(self, file_path: str) -> str:
+        return await asyncio.to_thread(self.read_text, file_path)
+
+    def read_text(self, file_path: str) -> str:
         with open(file_path, "r") as file:
-            return await asyncio.to_thread(file.read)
-
-    def load_msword(self, file_path: str) -> str:
-        document = DocxDocument(file_path)
-        text = "\n".join([paragraph.text for paragraph in document.paragraphs])
-        return text
-
-    def load_powerpoint(self, file_path: str) -> str:
-        presentation = Presentation(file_path)
-
-        extracted_text = ""
-        for index, slide in enumerate(presentation.slides):
-            extracted_text += f"# Slide {index + 1}\n"
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    for paragraph in shape.text_frame.paragraphs:
-                        extracted_text += f"{paragraph.text}\n"
-                    extracted_text += "\n"
-            extracted_text += "\n\n"
-        return extracted_text
+            return file.read()
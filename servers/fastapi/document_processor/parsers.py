@@ -0,0 +1,36 @@
+import pdfplumber
+from pptx import Presentation
+from docx import Document as DocxDocument
+
+
+# Runs in process pool workers, keep imports of this module light
+def load_msword(file_path: str) -> str:
+    document = DocxDocument(file_path)
+    text = "\n".join([paragraph.text for paragraph in document.paragraphs])
+    return text
+
+
+def load_powerpoint(file_path: str) -> str:
+    presentation = Presentation(file_path)
+
+    extracted_text = ""
+    for index, slide in enumerate(presentation.slides):
+        extracted_text += f"# Slide {index + 1}\n"
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                for paragraph in shape.text_frame.paragraphs:
+                    extracted_text += f"{paragraph.text}\n"
+                extracted_text += "\n"
+        extracted_text += "\n\n"
+    return extracted_text
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def load_pdf_pages(file_path: str, start: int, end: int) -> str:
+    # Each shard opens its own handle and only parses the pages in its range
+    with pdfplumber.open(file_path, pages=range(start + 1, end + 1)) as pdf:
+        return "".join([page.extract_text() or "" for page in pdf.pages])
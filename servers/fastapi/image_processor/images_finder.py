@@ -1,6 +1,8 @@
 import asyncio
 import os
+import shutil
 import uuid
+from typing import Optional
 import aiohttp
 from google import genai
 from google.genai.types import GenerateContentConfig
@@ -8,14 +10,32 @@ from google.genai.types import GenerateContentConfig
 from ppt_generator.models.query_and_prompt_models import (
     ImagePromptWithThemeAndAspectRatio,
 )
-from api.utils.utils import download_file, get_resource
+from api.models import SelectedLLMProvider
+from api.services.instances import IMAGE_CACHE_SERVICE, IMAGE_SCHEDULER_SERVICE
+from api.utils.utils import download_file, get_resource, get_user_config
 from api.utils.model_utils import (
     get_llm_client,
+    get_selected_llm_provider,
     is_custom_llm_selected,
     is_ollama_selected,
 )
 
 
+def copy_cached_image(cache_key: str, output_directory: str) -> Optional[str]:
+    blob_path = IMAGE_CACHE_SERVICE.get(cache_key)
+    if not blob_path:
+        return None
+    # Blobs keep the extension of the image they were cached from
+    image_path = os.path.join(
+        output_directory, f"{str(uuid.uuid4())}{os.path.splitext(blob_path)[1]}"
+    )
+    try:
+        shutil.copyfile(blob_path, image_path)
+    except OSError:
+        return None
+    return image_path
+
+
 async def generate_image(
     input: ImagePromptWithThemeAndAspectRatio,
     output_directory: str,
@@ -30,18 +50,45 @@ async def generate_image(
     )
     print(f"Request - Generating Image for {image_prompt}")
 
+    if is_ollama or is_custom_llm:
+        provider = "pexels"
+    else:
+        provider = get_selected_llm_provider().value
+
+    # Pexels searches only use the image prompt
+    cache_key = IMAGE_CACHE_SERVICE.get_key(
+        provider,
+        input.image_prompt,
+        None if provider == "pexels" else input.theme_prompt,
+        input.aspect_ratio.value,
+    )
+    cached_image_path = await asyncio.to_thread(
+        copy_cached_image, cache_key, output_directory
+    )
+    if cached_image_path:
+        print(f"Cache hit - Image for {image_prompt}")
+        return cached_image_path
+
     try:
         image_gen_func = (
             get_image_from_pexels
-            if is_ollama or is_custom_llm
+            if provider == "pexels"
             else (
                 generate_image_openai
-                if os.getenv("LLM") == "openai"
+                if provider == SelectedLLMProvider.OPENAI.value
                 else generate_image_google
             )
         )
-        image_path = await image_gen_func(image_prompt, output_directory)
+        image_path = await IMAGE_SCHEDULER_SERVICE.run(
+            provider, image_gen_func, image_prompt, output_directory
+        )
         if image_path and os.path.exists(image_path):
+            try:
+                await asyncio.to_thread(
+                    IMAGE_CACHE_SERVICE.put_file, cache_key, image_path
+                )
+            except OSError as e:
+                print(f"Error caching image: {e}")
             return image_path
         raise Exception(f"Image not found at {image_path}")
 
@@ -93,8 +140,9 @@ async def get_image_from_pexels(prompt: str, output_directory: str) -> str:
     async with aiohttp.ClientSession() as session:
         response = await session.get(
             f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-            headers={"Authorization": f'{os.getenv("PEXELS_API_KEY")}'},
+            headers={"Authorization": f"{get_user_config().PEXELS_API_KEY}"},
         )
+        response.raise_for_status()
         data = await response.json()
         image_url = data["photos"][0]["src"]["large"]
         image_path = os.path.join(output_directory, f"{str(uuid.uuid4())}.jpg")
@@ -0,0 +1,34 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+import api.sql_models  # noqa: F401 registers tables on SQLModel.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+
+def run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+# Connection is passed by api.services.database.migrate_database on startup
+connection = config.attributes.get("connection")
+if connection is not None:
+    run_migrations(connection)
+else:
+    from api.services.database import sql_engine
+
+    with sql_engine.connect() as connection:
+        run_migrations(connection)
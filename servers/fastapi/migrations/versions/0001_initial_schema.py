@@ -0,0 +1,95 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-07-14 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created before migrations were introduced already have these tables
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("presentationsqlmodel"):
+        op.create_table(
+            "presentationsqlmodel",
+            sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("prompt", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("n_slides", sa.Integer(), nullable=False),
+            sa.Column("theme", sa.JSON(), nullable=True),
+            sa.Column("file", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("structure", sa.JSON(), nullable=True),
+            sa.Column("notes", sa.JSON(), nullable=True),
+            sa.Column("outlines", sa.JSON(), nullable=True),
+            sa.Column("language", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("summary", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("thumbnail", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("data", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if not inspector.has_table("slidesqlmodel"):
+        op.create_table(
+            "slidesqlmodel",
+            sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("index", sa.Integer(), nullable=False),
+            sa.Column("type", sa.Integer(), nullable=False),
+            sa.Column("design_index", sa.Integer(), nullable=True),
+            sa.Column("images", sa.JSON(), nullable=True),
+            sa.Column("icons", sa.JSON(), nullable=True),
+            sa.Column(
+                "presentation", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+            ),
+            sa.Column("content", sa.JSON(), nullable=False),
+            sa.Column("properties", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_slidesqlmodel_index", "slidesqlmodel", ["index"], unique=False
+        )
+
+    if not inspector.has_table("keyvaluesqlmodel"):
+        op.create_table(
+            "keyvaluesqlmodel",
+            sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("key", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("value", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_keyvaluesqlmodel_key", "keyvaluesqlmodel", ["key"], unique=False
+        )
+
+    if not inspector.has_table("preferencessqlmodel"):
+        op.create_table(
+            "preferencessqlmodel",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("theme", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("preferencessqlmodel")
+    op.drop_index("ix_keyvaluesqlmodel_key", table_name="keyvaluesqlmodel")
+    op.drop_table("keyvaluesqlmodel")
+    op.drop_index("ix_slidesqlmodel_index", table_name="slidesqlmodel")
+    op.drop_table("slidesqlmodel")
+    op.drop_table("presentationsqlmodel")
@@ -0,0 +1,50 @@
+"""Presentation and slide indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-07-14 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    slide_indexes = [each["name"] for each in inspector.get_indexes("slidesqlmodel")]
+    presentation_indexes = [
+        each["name"] for each in inspector.get_indexes("presentationsqlmodel")
+    ]
+
+    if "ix_slidesqlmodel_presentation_index" not in slide_indexes:
+        op.create_index(
+            "ix_slidesqlmodel_presentation_index",
+            "slidesqlmodel",
+            ["presentation", "index"],
+            unique=False,
+        )
+    if "ix_presentationsqlmodel_created_at" not in presentation_indexes:
+        op.create_index(
+            "ix_presentationsqlmodel_created_at",
+            "presentationsqlmodel",
+            ["created_at"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_presentationsqlmodel_created_at", table_name="presentationsqlmodel"
+    )
+    op.drop_index("ix_slidesqlmodel_presentation_index", table_name="slidesqlmodel")
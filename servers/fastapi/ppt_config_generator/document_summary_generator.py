@@ -1,8 +1,16 @@
 import asyncio
+import hashlib
+import os
+import re
 from typing import List
 from openai.types.chat.chat_completion import ChatCompletion
 
-from api.utils.model_utils import get_llm_client, get_nano_model
+from api.services.instances import SUMMARY_CACHE_SERVICE
+from api.utils.model_utils import (
+    get_llm_client,
+    get_nano_model,
+    get_selected_llm_provider,
+)
 
 sysmte_prompt = """
 Generate a blog-style summary of the provided document in **more than 2000 words**.
@@ -20,25 +28,122 @@ Maintain as much information as possible.
 - If **slides structure is mentioned** in document, structure the summary in the same way.
 """
 
+chunk_system_prompt = """
+Summarize the provided part of a longer document.
+Maintain as much information as possible, it will be merged with the summaries of the other parts.
+
+### Notes
+
+- **Retain the main ideas, essential details, facts and figures** from the part.
+- Keep the **headings and order** of the part.
+- If **slides structure is mentioned** in the part, keep the slide titles.
+"""
+
+# Chunks are split at headings first, then at blank lines, then at line breaks
+CHUNK_BOUNDARIES = [r"\n(?=#{1,6} )", r"\n[ \t]*\n", r"\n"]
+
+# Merge rounds after which the summaries are truncated to fit the final call
+MAX_REDUCE_ROUNDS = 3
+
+
+def chunk_document(text: str, max_chars: int, level: int = 0) -> List[str]:
+    """
+    Splits text into chunks of at most max_chars at the coarsest boundary
+    possible. Joining the chunks gives back the text, nothing is dropped.
+    """
+    if len(text) <= max_chars:
+        return [text] if text else []
+    if level == len(CHUNK_BOUNDARIES):
+        return [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+
+    ends = [match.end() for match in re.finditer(CHUNK_BOUNDARIES[level], text)]
+    pieces = [text[start:end] for start, end in zip([0] + ends, ends + [len(text)])]
+
+    chunks = []
+    current_chunk = ""
+    for piece in pieces:
+        if len(current_chunk) + len(piece) <= max_chars:
+            current_chunk += piece
+            continue
+        if current_chunk:
+            chunks.append(current_chunk)
+        current_chunk = ""
+        if len(piece) <= max_chars:
+            current_chunk = piece
+        else:
+            chunks.extend(chunk_document(piece, max_chars, level + 1))
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
 
 async def generate_document_summary(documents: List[str]):
     client = get_llm_client()
     model = get_nano_model()
+    chunk_size = int(os.getenv("SUMMARY_CHUNK_SIZE") or 50000)
+    semaphore = asyncio.Semaphore(int(os.getenv("SUMMARY_CONCURRENCY") or 4))
+
+    async def summarize(system_prompt: str, text: str) -> str:
+        async with semaphore:
+            completion: ChatCompletion = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text},
+                ],
+            )
+        return completion.choices[0].message.content
+
+    # Summaries depend on the prompts and on how documents are chunked
+    prompt_hash = hashlib.sha256(
+        f"{sysmte_prompt}{chunk_system_prompt}{chunk_size}{MAX_REDUCE_ROUNDS}".encode()
+    ).hexdigest()
+    model_id = f"{get_selected_llm_provider().value}:{model}"
+
+    async def summarize_document(document: str) -> str:
+        cache_key = SUMMARY_CACHE_SERVICE.get_key(
+            hashlib.sha256(document.encode()).hexdigest(), model_id, prompt_hash
+        )
+        summary = await asyncio.to_thread(SUMMARY_CACHE_SERVICE.get_bytes, cache_key)
+        if summary is not None:
+            return summary.decode()
+
+        summary = await generate_summary(document)
+        try:
+            await asyncio.to_thread(
+                SUMMARY_CACHE_SERVICE.put_bytes, cache_key, summary.encode(), ".md"
+            )
+        except OSError as e:
+            print(f"Could not cache document summary: {e}")
+        return summary
+
+    async def generate_summary(document: str) -> str:
+        chunks = chunk_document(document, chunk_size)
+        if len(chunks) <= 1:
+            return await summarize(sysmte_prompt, document)
+
+        # Map chunks to summaries, then merge them in rounds until they fit
+        # in a single chunk
+        for _ in range(MAX_REDUCE_ROUNDS):
+            summaries = await asyncio.gather(
+                *[summarize(chunk_system_prompt, chunk) for chunk in chunks]
+            )
+            merged_chunks = chunk_document("\n\n".join(summaries), chunk_size)
+            if len(merged_chunks) <= 1:
+                return await summarize(sysmte_prompt, "".join(merged_chunks))
+            if len(merged_chunks) >= len(chunks):
+                # Summaries did not get shorter, another round would not help
+                break
+            chunks = merged_chunks
 
-    coroutines = []
-    for document in documents:
-        truncated_text = document[:200000]
-        coroutine = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": sysmte_prompt},
-                {"role": "user", "content": truncated_text},
-            ],
+        # Every summary keeps an equal share of the final input
+        share = max(chunk_size // len(summaries) - 2, 0)
+        return await summarize(
+            sysmte_prompt, "\n\n".join(each[:share] for each in summaries)
         )
-        coroutines.append(coroutine)
 
-    completions: List[ChatCompletion] = await asyncio.gather(*coroutines)
-    combined = "\n\n\n\n".join(
-        [completion.choices[0].message.content for completion in completions]
+    summaries = await asyncio.gather(
+        *[summarize_document(document) for document in documents]
     )
+    combined = "\n\n\n\n".join(summaries)
     return combined
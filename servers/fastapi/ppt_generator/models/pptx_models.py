@@ -136,6 +136,46 @@ class PptxPictureBoxModel(PptxShapeModel):
     picture: PptxPictureModel
 
 
+class PptxPictureTransformModel(BaseModel):
+    path: str
+    width: int
+    height: int
+    dpi: int
+    jpeg_quality: int
+    clip: bool = True
+    overlay: Optional[str] = None
+    border_radius: Optional[List[int]] = None
+    shape: Optional[PptxBoxShapeEnum] = None
+    object_fit: Optional[PptxObjectFitModel] = None
+
+    @property
+    def resample_only(self) -> bool:
+        return not (
+            self.clip
+            or self.border_radius
+            or self.overlay
+            or self.object_fit
+            or self.shape
+        )
+
+    @classmethod
+    def from_picture_box(
+        cls, picture_model: PptxPictureBoxModel, dpi: int, jpeg_quality: int
+    ) -> "PptxPictureTransformModel":
+        return cls(
+            path=picture_model.picture.path,
+            width=picture_model.position.width,
+            height=picture_model.position.height,
+            dpi=dpi,
+            jpeg_quality=jpeg_quality,
+            clip=picture_model.clip,
+            overlay=picture_model.overlay,
+            border_radius=picture_model.border_radius,
+            shape=picture_model.shape,
+            object_fit=picture_model.object_fit,
+        )
+
+
 class PptxConnectorModel(PptxShapeModel):
     type: MSO_CONNECTOR_TYPE = MSO_CONNECTOR_TYPE.STRAIGHT
     position: PptxPositionModel
@@ -154,5 +194,18 @@ class PptxSlideModel(BaseModel):
 
 class PptxPresentationModel(BaseModel):
     background_color: str
-    shapes: Optional[List[PptxShapeModel]] = None
+    shapes: Optional[
+        List[
+            PptxTextBoxModel
+            | PptxAutoShapeBoxModel
+            | PptxConnectorModel
+            | PptxPictureBoxModel
+        ]
+    ] = None
     slides: List[PptxSlideModel]
+
+
+class PptxImagesReportModel(BaseModel):
+    distinct_images: int
+    image_references: int
+    bytes_saved: int
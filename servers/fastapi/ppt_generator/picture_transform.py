@@ -0,0 +1,123 @@
+import os
+from typing import Optional, Tuple
+from PIL import Image
+
+from ppt_generator.models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxObjectFitEnum,
+    PptxPictureTransformModel,
+)
+from ppt_generator.utils import (
+    clip_image,
+    fit_image,
+    round_image_corners,
+    create_circle_image,
+    change_image_color,
+)
+
+# Bump when the output of transform_picture changes to invalidate cached pictures
+PICTURE_TRANSFORM_VERSION = 2
+
+
+def get_picture_size(
+    image_size: Tuple[int, int], transform: PptxPictureTransformModel
+) -> Tuple[int, int]:
+    """
+    Returns the pixel size a picture is rendered at in its box, the box size
+    at the transform DPI but never above the resolution of the source image.
+    """
+    image_width, image_height = image_size
+    box_width = max(transform.width, 1)
+    box_height = max(transform.height, 1)
+    scale = transform.dpi / 72
+    ratios = [image_width / box_width, image_height / box_height]
+
+    fit = transform.object_fit.fit if transform.object_fit else None
+    if fit == PptxObjectFitEnum.CONTAIN:
+        # Contained images only fill the box along one axis
+        scale = min(scale, max(ratios))
+    elif fit == PptxObjectFitEnum.COVER or (
+        transform.clip and not transform.object_fit
+    ):
+        scale = min(scale, *ratios)
+    else:
+        # Stretched images keep as many pixels as the box shows along each axis
+        return (
+            max(min(image_width, int(box_width * scale)), 1),
+            max(min(image_height, int(box_height * scale)), 1),
+        )
+
+    return max(int(box_width * scale), 1), max(int(box_height * scale), 1)
+
+
+def save_picture(image: Image.Image, output_path: str, jpeg_quality: int) -> str:
+    """
+    Saves the image as PNG if it uses transparency, as JPEG otherwise.
+    Returns output_path with the extension of the chosen format.
+    """
+    if image.getchannel("A").getextrema()[0] < 255:
+        output_path = f"{output_path}.png"
+        image.save(output_path, optimize=True)
+    else:
+        output_path = f"{output_path}.jpg"
+        image.convert("RGB").save(output_path, quality=jpeg_quality, optimize=True)
+    return output_path
+
+
+# Runs in process pool workers, keep imports of this module light
+def transform_picture(
+    transform: PptxPictureTransformModel, output_path: str
+) -> Optional[str]:
+    """
+    Applies the transform to the picture and resamples it to the size it is
+    rendered at. output_path has no extension, it is chosen on save.
+    """
+    try:
+        image = Image.open(transform.path)
+    except:
+        # Pictures python-pptx can embed but Pillow can not read are kept as they are
+        if transform.resample_only and os.path.isfile(transform.path):
+            return transform.path
+        print(f"Could not open image: {transform.path}")
+        return None
+
+    width, height = get_picture_size(image.size, transform)
+    if transform.resample_only and (
+        getattr(image, "is_animated", False)
+        or (image.format == "JPEG" and image.size == (width, height))
+    ):
+        return transform.path
+
+    image = image.convert("RGBA")
+    border_radius = None
+    if transform.border_radius:
+        border_radius = [
+            round(each * width / max(transform.width, 1))
+            for each in transform.border_radius
+        ]
+
+    # ? Applying border radius twice to support both clip and object fit
+    if border_radius:
+        image = round_image_corners(image, border_radius)
+    if transform.object_fit:
+        image = fit_image(
+            image,
+            width,
+            height,
+            transform.object_fit,
+        )
+    elif transform.clip:
+        image = clip_image(
+            image,
+            width,
+            height,
+        )
+    if image.size != (width, height):
+        image = image.resize((width, height), Image.LANCZOS)
+    if border_radius:
+        image = round_image_corners(image, border_radius)
+    if transform.shape == PptxBoxShapeEnum.CIRCLE:
+        image = create_circle_image(image)
+    if transform.overlay:
+        image = change_image_color(image, transform.overlay)
+    return save_picture(image, output_path, transform.jpeg_quality)
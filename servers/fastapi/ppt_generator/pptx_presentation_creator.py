@@ -1,45 +1,65 @@
+import asyncio
+import hashlib
+import io
+import json
 import os
-from typing import List, Optional
+import shutil
+from typing import Dict, List, Optional, Tuple
 import uuid
 from lxml import etree
 
 from pptx import Presentation
+from pptx.oxml import parse_xml
 from pptx.shapes.autoshape import Shape
 from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
 
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 from ppt_generator.models.pptx_models import (
     PptxAutoShapeBoxModel,
-    PptxBoxShapeEnum,
     PptxConnectorModel,
     PptxFillModel,
     PptxFontModel,
+    PptxImagesReportModel,
     PptxParagraphModel,
     PptxPictureBoxModel,
+    PptxPictureTransformModel,
     PptxPositionModel,
     PptxPresentationModel,
     PptxShadowModel,
+    PptxShapeModel,
     PptxSlideModel,
     PptxSpacingModel,
     PptxStrokeModel,
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from ppt_generator.utils import (
-    clip_image,
-    fit_image,
-    round_image_corners,
-    create_circle_image,
-    change_image_color,
+from api.services.instances import (
+    PICTURE_CACHE_SERVICE,
+    PROCESS_POOL_SERVICE,
+    SLIDE_CACHE_SERVICE,
+)
+from api.utils.utils import get_file_hash
+from ppt_generator.utils import tokenize_markdown_line
+from ppt_generator.picture_transform import (
+    PICTURE_TRANSFORM_VERSION,
+    transform_picture,
 )
 
 BLANK_SLIDE_LAYOUT = 6
 
+# Bump when the XML generated for a slide model changes to invalidate cached slides
+SLIDE_CACHE_VERSION = 3
+
+RELATIONSHIP_ATTRIBUTES = [
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}link",
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id",
+]
+
 
 class PptxPresentationCreator:
 
@@ -55,14 +75,223 @@ class PptxPresentationCreator:
 
         self._slide_fill = PptxFillModel(color=ppt_model.background_color)
 
+        # Pictures are resampled to their size on the slide at this DPI
+        self._image_dpi = int(os.getenv("PPTX_IMAGE_DPI") or 150)
+        self._image_jpeg_quality = int(os.getenv("PPTX_IMAGE_JPEG_QUALITY") or 85)
+
+        # Processed image path of each picture model by id, None if it failed to open
+        self._prepared_pictures: Dict[int, Optional[str]] = {}
+
+        # Bold and italic variants of paragraph fonts by font id
+        self._derived_fonts: Dict[Tuple[int, bool, bool], PptxFontModel] = {}
+
+        # Fingerprint of each slide and the cached slide XML and media of
+        # unchanged slides, both by slide index
+        self._slide_fingerprints: Dict[int, str] = {}
+        self._cached_slides: Dict[int, Tuple[bytes, List[Tuple[str, bytes]]]] = {}
+
+    async def prepare(self):
+        await asyncio.to_thread(self.load_cached_slides)
+        await self.prepare_pictures()
+
+    async def prepare_pictures(self):
+        picture_models = {
+            id(shape_model): shape_model
+            for index, slide_model in enumerate(self._slide_models)
+            if index not in self._cached_slides
+            for shape_model in self.get_slide_shapes(slide_model)
+            if type(shape_model) is PptxPictureBoxModel
+        }
+        transforms = [
+            (picture_model, self.get_picture_transform(picture_model))
+            for picture_model in picture_models.values()
+        ]
+
+        cache_keys = await asyncio.to_thread(
+            lambda: [self.get_picture_cache_key(each) for _, each in transforms]
+        )
+
+        # Identical transforms of the same source image are only processed once
+        unique_transforms = {}
+        for (picture_model, transform), cache_key in zip(transforms, cache_keys):
+            unique_transforms.setdefault(
+                cache_key or id(picture_model), (transform, cache_key, [])
+            )[2].append(picture_model)
+
+        results = await asyncio.gather(
+            *[
+                self.prepare_picture(transform, cache_key)
+                for transform, cache_key, _ in unique_transforms.values()
+            ],
+            return_exceptions=True,
+        )
+        for (_, _, each_picture_models), result in zip(
+            unique_transforms.values(), results
+        ):
+            # Pictures that failed in the pool are processed again in add_picture
+            if isinstance(result, Exception):
+                print(f"Could not process image in pool: {result}")
+                continue
+            for picture_model in each_picture_models:
+                self._prepared_pictures[id(picture_model)] = result
+
+    async def prepare_picture(
+        self, transform: PptxPictureTransformModel, cache_key: Optional[str]
+    ) -> Optional[str]:
+        image_path = self.get_temp_picture_path()
+        if cache_key:
+            cached_path = await asyncio.to_thread(
+                self.copy_cached_picture, cache_key, image_path
+            )
+            if cached_path:
+                return cached_path
+
+        image_path = await PROCESS_POOL_SERVICE.run(
+            transform_picture, transform, image_path
+        )
+        if cache_key and image_path:
+            try:
+                await asyncio.to_thread(
+                    PICTURE_CACHE_SERVICE.put_file, cache_key, image_path
+                )
+            except OSError as e:
+                print(f"Could not cache processed image: {e}")
+        return image_path
+
+    def copy_cached_picture(self, cache_key: str, image_path: str) -> Optional[str]:
+        blob_path = PICTURE_CACHE_SERVICE.get(cache_key)
+        if not blob_path:
+            return None
+        # Cached pictures are PNG or JPEG, the blob keeps the extension
+        image_path += os.path.splitext(blob_path)[1]
+        try:
+            shutil.copyfile(blob_path, image_path)
+        except OSError:
+            return None
+        return image_path
+
+    def get_picture_transform(
+        self, picture_model: PptxPictureBoxModel
+    ) -> PptxPictureTransformModel:
+        return PptxPictureTransformModel.from_picture_box(
+            picture_model, self._image_dpi, self._image_jpeg_quality
+        )
+
+    def get_picture_cache_key(
+        self, transform: PptxPictureTransformModel
+    ) -> Optional[str]:
+        try:
+            source_hash = get_file_hash(transform.path)
+        except OSError:
+            return None
+        return PICTURE_CACHE_SERVICE.get_key(
+            PICTURE_TRANSFORM_VERSION,
+            source_hash,
+            transform.model_dump(mode="json", exclude={"path"}),
+        )
+
+    def get_temp_picture_path(self) -> str:
+        # Extension is added by transform_picture depending on the output format
+        return os.path.join(self._temp_dir, str(uuid.uuid4()))
+
     def create_ppt(self):
 
-        for slide_model in self._slide_models:
-            # Adding global shapes to slide
-            if self._ppt_model.shapes:
-                slide_model.shapes.append(self._ppt_model.shapes)
+        for index, slide_model in enumerate(self._slide_models):
+            if index in self._cached_slides:
+                self.add_cached_slide(*self._cached_slides[index])
+                continue
+
+            slide = self.add_and_populate_slide(slide_model)
+            if index in self._slide_fingerprints:
+                try:
+                    self.cache_slide(self._slide_fingerprints[index], slide)
+                except OSError as e:
+                    print(f"Could not cache slide: {e}")
+
+    def get_slide_fingerprint(self, slide_model: PptxSlideModel) -> str:
+        # Pictures are fingerprinted by content as files can change in place
+        picture_hashes = []
+        for shape_model in self.get_slide_shapes(slide_model):
+            if type(shape_model) is PptxPictureBoxModel:
+                try:
+                    picture_hashes.append(get_file_hash(shape_model.picture.path))
+                except OSError:
+                    picture_hashes.append(None)
+
+        return SLIDE_CACHE_SERVICE.get_key(
+            SLIDE_CACHE_VERSION,
+            PICTURE_TRANSFORM_VERSION,
+            self._image_dpi,
+            self._image_jpeg_quality,
+            self._ppt_model.background_color,
+            [each.model_dump(mode="json") for each in self._ppt_model.shapes or []],
+            slide_model.model_dump(mode="json"),
+            picture_hashes,
+        )
 
-            self.add_and_populate_slide(slide_model)
+    def load_cached_slides(self):
+        if not SLIDE_CACHE_SERVICE.enabled:
+            return
+
+        for index, slide_model in enumerate(self._slide_models):
+            fingerprint = self.get_slide_fingerprint(slide_model)
+            self._slide_fingerprints[index] = fingerprint
+
+            cached_slide = SLIDE_CACHE_SERVICE.get_bytes(fingerprint)
+            if not cached_slide:
+                continue
+            cached_slide = json.loads(cached_slide)
+
+            media = []
+            for rId, media_hash in cached_slide["media"]:
+                blob = SLIDE_CACHE_SERVICE.get_bytes(
+                    SLIDE_CACHE_SERVICE.get_key("media", media_hash)
+                )
+                if blob is None:
+                    break
+                media.append((rId, blob))
+            else:
+                self._cached_slides[index] = (cached_slide["xml"].encode(), media)
+
+    def cache_slide(self, fingerprint: str, slide: Slide):
+        media = []
+        for rId, relationship in slide.part.rels.items():
+            if relationship.reltype == RT.SLIDE_LAYOUT:
+                continue
+            # Slides related to anything but images are rebuilt on every export
+            if relationship.reltype != RT.IMAGE or relationship.is_external:
+                return
+
+            blob = relationship.target_part.blob
+            media_hash = hashlib.sha256(blob).hexdigest()
+            SLIDE_CACHE_SERVICE.put_bytes(
+                SLIDE_CACHE_SERVICE.get_key("media", media_hash),
+                blob,
+                f".{relationship.target_part.partname.ext}",
+            )
+            media.append((rId, media_hash))
+
+        cached_slide = {
+            "xml": tostring(slide._element.cSld, encoding="unicode"),
+            "media": media,
+        }
+        SLIDE_CACHE_SERVICE.put_bytes(fingerprint, json.dumps(cached_slide).encode())
+
+    def add_cached_slide(self, xml: bytes, media: List[Tuple[str, bytes]]):
+        slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
+
+        new_rIds = {}
+        for rId, blob in media:
+            _, new_rIds[rId] = slide.part.get_or_add_image_part(io.BytesIO(blob))
+
+        cSld = parse_xml(xml)
+        for element in cSld.iter():
+            for attribute in RELATIONSHIP_ATTRIBUTES:
+                rId = element.get(attribute)
+                if rId in new_rIds:
+                    element.set(attribute, new_rIds[rId])
+
+        slide._element.replace(slide._element.cSld, cSld)
 
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
@@ -84,13 +313,17 @@ class PptxPresentationCreator:
 
         theme_part._blob = tostring(theme)
 
-    def add_and_populate_slide(self, slide_model: PptxSlideModel):
+    def get_slide_shapes(self, slide_model: PptxSlideModel) -> List[PptxShapeModel]:
+        # Global shapes are added on top of every slide
+        return slide_model.shapes + (self._ppt_model.shapes or [])
+
+    def add_and_populate_slide(self, slide_model: PptxSlideModel) -> Slide:
         slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
 
         if self._slide_fill:
             self.apply_fill_to_shape(slide.background, self._slide_fill)
 
-        for shape_model in slide_model.shapes:
+        for shape_model in self.get_slide_shapes(slide_model):
             model_type = type(shape_model)
 
             if model_type is PptxPictureBoxModel:
@@ -105,6 +338,8 @@ class PptxPresentationCreator:
             elif model_type is PptxConnectorModel:
                 self.add_connector(slide, shape_model)
 
+        return slide
+
     def add_connector(self, slide: Slide, connector_model: PptxConnectorModel):
         if connector_model.thickness == 0:
             return
@@ -115,45 +350,15 @@ class PptxPresentationCreator:
         connector_shape.line.color.rgb = RGBColor.from_string(connector_model.color)
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
-        image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.overlay
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
-                return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.overlay:
-                image = change_image_color(image, picture_model.overlay)
-            image_path = os.path.join(self._temp_dir, f"{str(uuid.uuid4())}.png")
-            image.save(image_path)
+        if id(picture_model) in self._prepared_pictures:
+            image_path = self._prepared_pictures[id(picture_model)]
+        else:
+            image_path = transform_picture(
+                self.get_picture_transform(picture_model),
+                self.get_temp_picture_path(),
+            )
+        if not image_path:
+            return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
@@ -225,77 +430,44 @@ class PptxPresentationCreator:
             text_run = paragraph.add_run()
             self.populate_text_run(text_run, text_run_model)
 
-    def parse_markdown_text_to_text_runs(self, font: PptxFontModel, text: str):
+    def parse_markdown_text_to_text_runs(
+        self, font: Optional[PptxFontModel], text: str
+    ) -> List[PptxTextRunModel]:
         text_runs = []
-        for line in text.split("\n"):
-            current_pos = 0
-            while current_pos < len(line):
-                # Check for bold and italic (***text***)
-                if (
-                    line[current_pos:].startswith("***")
-                    and "***" in line[current_pos + 3 :]
-                ):
-                    end_pos = line.find("***", current_pos + 3)
-                    text_content = line[current_pos + 3 : end_pos]
-                    font_json = font.model_dump()
-                    font_json["bold"] = True
-                    font_json["italic"] = True
-                    text_runs.append(
-                        PptxTextRunModel(
-                            text=text_content, font=PptxFontModel(**font_json)
-                        )
-                    )
-                    current_pos = end_pos + 3
-                # Check for bold (**text**)
-                elif (
-                    line[current_pos:].startswith("**")
-                    and "**" in line[current_pos + 2 :]
-                ):
-                    end_pos = line.find("**", current_pos + 2)
-                    text_content = line[current_pos + 2 : end_pos]
-                    font_json = font.model_dump()
-                    font_json["bold"] = True
-                    text_runs.append(
-                        PptxTextRunModel(
-                            text=text_content, font=PptxFontModel(**font_json)
-                        )
-                    )
-                    current_pos = end_pos + 2
-                # Check for italic (*text*)
-                elif (
-                    line[current_pos:].startswith("__")
-                    and "__" in line[current_pos + 2 :]
-                ):
-                    end_pos = line.find("__", current_pos + 2)
-                    text_content = line[current_pos + 2 : end_pos]
-                    font_json = font.model_dump()
-                    font_json["italic"] = True
-                    text_runs.append(
-                        PptxTextRunModel(
-                            text=text_content, font=PptxFontModel(**font_json)
-                        )
+        lines = text.split("\n")
+        for index, line in enumerate(lines):
+            for text_content, bold, italic in tokenize_markdown_line(line):
+                text_runs.append(
+                    PptxTextRunModel(
+                        text=text_content,
+                        font=(
+                            self.get_derived_font(font, bold, italic)
+                            if bold or italic
+                            else font
+                        ),
                     )
-                    current_pos = end_pos + 2
-                else:
-                    # Find the next formatting marker or end of line
-                    next_marker = float("inf")
-                    for marker in ["***", "**", "__"]:
-                        pos = line.find(marker, current_pos)
-                        if pos != -1:
-                            next_marker = min(next_marker, pos)
-
-                    end_pos = next_marker if next_marker != float("inf") else len(line)
-                    text_content = line[current_pos:end_pos]
-                    if text_content:  # Only add non-empty text
-                        text_runs.append(PptxTextRunModel(text=text_content, font=font))
-                    current_pos = end_pos
+                )
 
             # Add newline if not the last line
-            if line != text.split("\n")[-1]:
+            if index < len(lines) - 1:
                 text_runs.append(PptxTextRunModel(text="\n"))
 
         return text_runs
 
+    def get_derived_font(
+        self, font: Optional[PptxFontModel], bold: bool, italic: bool
+    ) -> PptxFontModel:
+        # Paragraph fonts live as long as the presentation model, so ids are stable
+        key = (id(font), bold, italic)
+        if key not in self._derived_fonts:
+            update = {"bold": True} if bold else {}
+            if italic:
+                update["italic"] = True
+            self._derived_fonts[key] = (font or PptxFontModel()).model_copy(
+                update=update
+            )
+        return self._derived_fonts[key]
+
     def populate_text_run(self, text_run: _Run, text_run_model: PptxTextRunModel):
         text_run.text = text_run_model.text
         if text_run_model.font:
@@ -417,5 +589,26 @@ class PptxPresentationCreator:
         font.italic = font_model.italic
         font.size = Pt(font_model.size)
 
+    def get_images_report(self) -> PptxImagesReportModel:
+        # Identical image bytes share one part in the package,
+        # however many pictures on however many slides show them
+        image_parts = {}
+        image_references = 0
+        referenced_bytes = 0
+        for slide in self._ppt.slides:
+            for blip in slide._element.xpath(".//a:blip[@r:embed]"):
+                image_part = slide.part.related_part(
+                    blip.get(RELATIONSHIP_ATTRIBUTES[0])
+                )
+                image_parts[image_part.partname] = len(image_part.blob)
+                image_references += 1
+                referenced_bytes += len(image_part.blob)
+
+        return PptxImagesReportModel(
+            distinct_images=len(image_parts),
+            image_references=image_references,
+            bytes_saved=referenced_bytes - sum(image_parts.values()),
+        )
+
     def save(self, path: str):
         self._ppt.save(path)
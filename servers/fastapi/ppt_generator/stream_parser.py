@@ -0,0 +1,68 @@
+import json
+from typing import List, Optional
+
+
+class SlidesStreamParser:
+    """
+    Incremental parser of a streamed presentation JSON object.
+    Chunks are scanned once as they arrive, and every object of the top
+    level "slides" array is returned by feed as soon as it is complete.
+    """
+
+    def __init__(self, key: str = "slides"):
+        self.key = key
+        self.text = ""
+
+        self._position = 0
+        self._containers: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._in_slides = False
+        self._slide_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        self.text += chunk
+
+        slides = []
+        text = self.text
+        for position in range(self._position, len(text)):
+            character = text[position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif character == "\\":
+                    self._escaped = True
+                elif character == '"':
+                    self._in_string = False
+                    # Last string of the top level object before "[" is its key
+                    if len(self._containers) == 1:
+                        self._last_key = json.loads(
+                            text[self._string_start : position + 1]
+                        )
+                continue
+
+            if character == '"':
+                self._in_string = True
+                self._string_start = position
+            elif character in "{[":
+                self._containers.append(character)
+                depth = len(self._containers)
+                if depth == 2 and character == "[":
+                    self._in_slides = self._last_key == self.key
+                elif depth == 3 and character == "{" and self._in_slides:
+                    self._slide_start = position
+            elif character in "}]":
+                depth = len(self._containers)
+                if depth == 3 and self._slide_start is not None:
+                    slides.append(json.loads(text[self._slide_start : position + 1]))
+                    self._slide_start = None
+                elif depth == 2:
+                    self._in_slides = False
+                if self._containers:
+                    self._containers.pop()
+
+        self._position = len(text)
+        return slides
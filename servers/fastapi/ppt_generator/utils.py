@@ -1,4 +1,6 @@
-from typing import List, Optional
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from pptx.util import Pt
 
 from PIL import Image, ImageDraw
@@ -12,6 +14,61 @@ def pt_from_optional_int(num: Optional[int]):
     return Pt(num)
 
 
+# Markdown markers and whether they make their text bold and italic,
+# longer markers are matched first
+MARKDOWN_MARKERS = [("***", True, True), ("**", True, False), ("__", False, True)]
+
+
+@lru_cache(maxsize=4096)
+def tokenize_markdown_line(line: str) -> Tuple[Tuple[str, bool, bool], ...]:
+    """
+    Splits a line of markdown into (text, bold, italic) tokens in a single pass.
+    Markers without a closing marker are kept as literal text.
+    """
+    # Start of every occurrence of each marker, overlapping ones included
+    marker_positions = {}
+    for marker, _, _ in MARKDOWN_MARKERS:
+        positions = []
+        position = line.find(marker)
+        while position != -1:
+            positions.append(position)
+            position = line.find(marker, position + 1)
+        marker_positions[marker] = positions
+
+    def find_marker(marker: str, start: int) -> int:
+        positions = marker_positions[marker]
+        index = bisect_left(positions, start)
+        return positions[index] if index < len(positions) else -1
+
+    tokens = []
+    text_start = 0
+    current_pos = 0
+    while current_pos < len(line):
+        for marker, bold, italic in MARKDOWN_MARKERS:
+            if not line.startswith(marker, current_pos):
+                continue
+            end_pos = find_marker(marker, current_pos + len(marker))
+            if end_pos == -1:
+                continue
+            if text_start < current_pos:
+                tokens.append((line[text_start:current_pos], False, False))
+            tokens.append((line[current_pos + len(marker) : end_pos], bold, italic))
+            current_pos = text_start = end_pos + len(marker)
+            break
+        else:
+            # Jump to the next marker, unmatched markers stay in the text
+            next_markers = [
+                find_marker(marker, current_pos + 1)
+                for marker, _, _ in MARKDOWN_MARKERS
+            ]
+            next_markers = [each for each in next_markers if each != -1]
+            current_pos = min(next_markers) if next_markers else len(line)
+
+    if text_start < len(line):
+        tokens.append((line[text_start:], False, False))
+    return tuple(tokens)
+
+
 def clip_image(
     image: Image.Image,
     width: int,
@@ -119,34 +176,20 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
 
 
 def change_image_color(img: Image.Image, color: str) -> Image.Image:
-    # r, g, b, alpha = img.split()
-
-    # color_overlay = Image.new("RGBA", img.size, color=f"#{color}")
-    # return Image.composite(color_overlay, img, alpha)
     if color.startswith("#"):
         color = color[1:]
     r_new = int(color[:2], 16)
     g_new = int(color[2:4], 16)
     b_new = int(color[4:], 16)
 
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Apply new color while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((r_new, g_new, b_new, a))
-        else:
-            new_data.append((0, 0, 0, 0))
+    # Apply new color while preserving transparency,
+    # fully transparent pixels become (0, 0, 0, 0)
+    alpha = img.getchannel("A")
+    visible_mask = alpha.point([0] + [255] * 255)
 
-    # Create new image with modified data
     new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
+    new_img.paste((r_new, g_new, b_new), mask=visible_mask)
+    new_img.putalpha(alpha)
     return new_img
 
 
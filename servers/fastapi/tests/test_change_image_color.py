@@ -0,0 +1,35 @@
+import random
+
+from PIL import Image
+
+from ppt_generator.utils import change_image_color
+
+
+def change_image_color_per_pixel(img: Image.Image, color: str) -> Image.Image:
+    r_new, g_new, b_new = int(color[:2], 16), int(color[2:4], 16), int(color[4:], 16)
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(
+        [
+            (r_new, g_new, b_new, a) if a != 0 else (0, 0, 0, 0)
+            for *_, a in img.getdata()
+        ]
+    )
+    return new_img
+
+
+def test_change_image_color_matches_per_pixel_overlay():
+    rng = random.Random(0)
+    img = Image.new("RGBA", (64, 48))
+    img.putdata(
+        [
+            tuple(rng.randint(0, 255) for _ in range(3))
+            + (rng.choice([0, 0, 1, 128, 255]),)
+            for _ in range(64 * 48)
+        ]
+    )
+
+    for color in ["#ff8000", "1a2b3c"]:
+        expected = change_image_color_per_pixel(img, color.lstrip("#"))
+        new_img = change_image_color(img, color)
+        assert new_img.mode == "RGBA"
+        assert new_img.tobytes() == expected.tobytes()
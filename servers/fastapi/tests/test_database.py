@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlmodel import delete, select
+
+from api.services import database
+from api.services.database import get_async_sql_session, migrate_database
+from api.sql_models import PresentationSqlModel, SlideSqlModel
+
+
+def use_temp_database(tmp_path, monkeypatch):
+    # Migrations and rows go to a temporary database instead of the app one
+    database_url = f"sqlite:///{tmp_path / 'fastapi.db'}"
+    sql_engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    event.listen(sql_engine, "connect", database.set_sqlite_pragmas)
+    monkeypatch.setattr(database, "database_url", database_url)
+    monkeypatch.setattr(database, "sql_engine", sql_engine)
+    # Created from database_url on first use
+    monkeypatch.setattr(database, "_async_sql_engine", None)
+
+
+@pytest.mark.parametrize("session_mode", ["async", "sync"])
+def test_async_sql_session(session_mode, tmp_path, monkeypatch):
+    use_temp_database(tmp_path, monkeypatch)
+    monkeypatch.setattr(database, "database_session_mode", session_mode)
+    migrate_database()
+
+    async def run():
+        presentation = PresentationSqlModel(n_slides=1)
+        slide = SlideSqlModel(index=0, type=1, presentation=presentation.id, content={})
+        async with get_async_sql_session() as sql_session:
+            sql_session.add_all([presentation, slide])
+            await sql_session.commit()
+            await sql_session.refresh(presentation)
+
+        # Attributes stay loaded after the session is closed
+        assert presentation.n_slides == 1
+
+        async with get_async_sql_session() as sql_session:
+            slides = (
+                await sql_session.exec(
+                    select(SlideSqlModel).where(
+                        SlideSqlModel.presentation == presentation.id
+                    )
+                )
+            ).all()
+            assert [each.id for each in slides] == [slide.id]
+
+            await sql_session.exec(
+                delete(SlideSqlModel).where(
+                    SlideSqlModel.presentation == presentation.id
+                )
+            )
+            await sql_session.delete(
+                await sql_session.get(PresentationSqlModel, presentation.id)
+            )
+            await sql_session.commit()
+
+        async with get_async_sql_session() as sql_session:
+            assert await sql_session.get(PresentationSqlModel, presentation.id) is None
+            assert await sql_session.get(SlideSqlModel, slide.id) is None
+
+    asyncio.run(run())
+
+
+def test_get_async_database_url():
+    assert (
+        database.get_async_database_url("sqlite:////tmp/fastapi.db")
+        == "sqlite+aiosqlite:////tmp/fastapi.db"
+    )
+    assert (
+        database.get_async_database_url("postgresql+psycopg2://user@host/db")
+        == "postgresql+asyncpg://user@host/db"
+    )
+    assert (
+        database.get_async_database_url("mysql://user@host/db")
+        == "mysql+aiomysql://user@host/db"
+    )
+
+
+def test_sqlite_pragmas(tmp_path, monkeypatch):
+    use_temp_database(tmp_path, monkeypatch)
+
+    async def get_async_pragmas():
+        async with database.get_async_sql_engine().connect() as connection:
+            return [
+                (await connection.exec_driver_sql(f"PRAGMA {pragma}")).scalar()
+                for pragma in ["journal_mode", "synchronous", "busy_timeout"]
+            ]
+
+    with database.sql_engine.connect() as connection:
+        pragmas = [
+            connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+            for pragma in ["journal_mode", "synchronous", "busy_timeout"]
+        ]
+
+    # synchronous=NORMAL is reported as 1
+    assert pragmas == ["wal", 1, 5000]
+    assert asyncio.run(get_async_pragmas()) == pragmas
@@ -0,0 +1,62 @@
+import os
+
+from api.services.disk_cache import DiskCacheService
+
+
+def test_disk_cache_dedupes_and_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    disk_cache = DiskCacheService("test", max_size=10)
+
+    first_key = disk_cache.get_key("openai", "a cat", "dark", "1:1")
+    second_key = disk_cache.get_key("openai", "a dog", "dark", "1:1")
+    assert disk_cache.get(first_key) is None
+
+    first_blob = disk_cache.put_bytes(first_key, b"12345", ".jpg")
+    # Same content under another key is stored once
+    assert disk_cache.put_bytes(second_key, b"12345", ".jpg") == first_blob
+    assert disk_cache.get_bytes(second_key) == b"12345"
+
+    output_path = tmp_path / "output.jpg"
+    assert disk_cache.copy_to(first_key, str(output_path))
+    assert output_path.read_bytes() == b"12345"
+
+    os.utime(first_blob, (0, 0))
+    third_key = disk_cache.get_key("openai", "a bird", "dark", "1:1")
+    disk_cache.put_bytes(third_key, b"abcdefgh", ".jpg")
+
+    assert disk_cache.get(first_key) is None
+    assert disk_cache.get(second_key) is None
+    assert disk_cache.get_bytes(third_key) == b"abcdefgh"
+    # Keys of evicted blobs are removed on their first miss
+    assert sorted(os.listdir(disk_cache.keys_dir)) == [third_key]
+
+
+def test_disk_cache_expires_keys(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    disk_cache = DiskCacheService("test", max_size=100, ttl=60)
+
+    key = disk_cache.get_key("prompt")
+    disk_cache.put_bytes(key, b"content")
+    assert disk_cache.get_bytes(key) == b"content"
+
+    os.utime(disk_cache.get_key_path(key), (0, 0))
+    assert disk_cache.get(key) is None
+
+
+def test_disk_cache_scans_blobs_only_when_above_max_size(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    disk_cache = DiskCacheService("test", max_size=10)
+    scans = []
+    evict = disk_cache.evict
+    monkeypatch.setattr(disk_cache, "evict", lambda: scans.append(1) or evict())
+
+    disk_cache.put_bytes(disk_cache.get_key("first"), b"1234")
+    # Blobs still being written are not counted
+    (tmp_path / "cache" / "test" / "blobs" / "blob.tmp").write_bytes(b"x" * 100)
+    disk_cache.put_bytes(disk_cache.get_key("second"), b"5678")
+    assert len(scans) == 1
+
+    disk_cache.put_bytes(disk_cache.get_key("third"), b"abcd")
+    assert len(scans) == 2
+    assert disk_cache.get(disk_cache.get_key("first")) is None
+    assert disk_cache.get_bytes(disk_cache.get_key("third")) == b"abcd"
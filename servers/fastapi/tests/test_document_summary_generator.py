@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+from api.models import SelectedLLMProvider
+from api.services.disk_cache import DiskCacheService
+from ppt_config_generator import document_summary_generator
+from ppt_config_generator.document_summary_generator import chunk_document
+
+
+def test_chunk_document_splits_at_boundaries_without_dropping_text():
+    # Third slide is too long for one chunk, the tail is one long line
+    sections = [
+        f"# Slide {index}\n"
+        + "\n\n".join(f"Paragraph {j} " * 20 for j in range(8 if index == 2 else 3))
+        for index in range(4)
+    ]
+    text = "\n".join(sections) + "\n" + "x" * 2500
+
+    chunks = chunk_document(text, 1000)
+
+    assert "".join(chunks) == text
+    assert all(0 < len(chunk) <= 1000 for chunk in chunks)
+    assert chunks[:2] == [sections[0] + "\n", sections[1] + "\n"]
+    # Long sections are split at blank lines
+    assert chunks[2].startswith("# Slide 2") and chunks[2].endswith("\n\n")
+    assert chunks[3].startswith("Paragraph")
+    assert chunks[-3:] == ["x" * 1000, "x" * 1000, "x" * 500]
+
+    assert chunk_document("short", 1000) == ["short"]
+    assert chunk_document("", 1000) == []
+
+
+def test_summaries_are_cached_per_document_and_model(tmp_path, monkeypatch):
+    requests = []
+
+    async def create(model, messages):
+        requests.append(model)
+        message = SimpleNamespace(content=f"Summary by {model}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace()))
+    client.chat.completions.create = create
+    monkeypatch.setattr(document_summary_generator, "get_llm_client", lambda: client)
+    monkeypatch.setattr(
+        document_summary_generator,
+        "get_selected_llm_provider",
+        lambda: SelectedLLMProvider.OPENAI,
+    )
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(
+        document_summary_generator,
+        "SUMMARY_CACHE_SERVICE",
+        DiskCacheService("summaries", max_size=1024 * 1024),
+    )
+
+    documents = ["First document", "Second document"]
+    for model in ["first", "first", "second"]:
+        monkeypatch.setattr(document_summary_generator, "get_nano_model", lambda: model)
+        summary = asyncio.run(
+            document_summary_generator.generate_document_summary(documents)
+        )
+        assert summary == f"Summary by {model}\n\n\n\nSummary by {model}"
+
+    assert requests == ["first", "first", "second", "second"]
+
+
+def test_final_summary_input_fits_in_a_chunk(tmp_path, monkeypatch):
+    inputs = []
+
+    async def create(model, messages):
+        # Summaries that do not get shorter than their input
+        system_prompt, text = [each["content"] for each in messages]
+        inputs.append((system_prompt, text))
+        message = SimpleNamespace(content=text + "\n")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace()))
+    client.chat.completions.create = create
+    monkeypatch.setattr(document_summary_generator, "get_llm_client", lambda: client)
+    monkeypatch.setattr(document_summary_generator, "get_nano_model", lambda: "nano")
+    monkeypatch.setattr(
+        document_summary_generator,
+        "get_selected_llm_provider",
+        lambda: SelectedLLMProvider.OPENAI,
+    )
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(
+        document_summary_generator,
+        "SUMMARY_CACHE_SERVICE",
+        DiskCacheService("summaries", max_size=1024 * 1024),
+    )
+    monkeypatch.setenv("SUMMARY_CHUNK_SIZE", "1000")
+
+    document = "\n\n".join(f"Paragraph {index} " * 20 for index in range(10))
+    asyncio.run(document_summary_generator.generate_document_summary([document]))
+
+    assert all(len(text) <= 1000 for _, text in inputs)
+    final_prompt, final_text = inputs[-1]
+    assert final_prompt == document_summary_generator.sysmte_prompt
+    assert final_text.startswith("Paragraph 0") and "Paragraph 9" in final_text
@@ -0,0 +1,132 @@
+import asyncio
+
+from docx import Document as DocxDocument
+from pptx import Presentation
+from pptx.util import Pt
+
+from api.services.disk_cache import DiskCacheService
+from api.services.instances import PROCESS_POOL_SERVICE
+from document_processor import loader
+from document_processor.loader import DocumentsLoader
+
+
+def use_temp_document_cache(tmp_path, monkeypatch):
+    # Documents parsed by earlier runs must not be served from the app cache
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(
+        loader,
+        "DOCUMENT_CACHE_SERVICE",
+        DiskCacheService("documents", max_size=64 * 1024 * 1024),
+    )
+
+
+def test_documents_are_loaded_in_input_order(tmp_path, monkeypatch):
+    use_temp_document_cache(tmp_path, monkeypatch)
+    paths = []
+    for index in range(3):
+        docx_path = tmp_path / f"document_{index}.docx"
+        docx_document = DocxDocument()
+        docx_document.add_paragraph(f"Word document {index}")
+        docx_document.save(docx_path)
+
+        pptx_path = tmp_path / f"presentation_{index}.pptx"
+        presentation = Presentation()
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        textbox = slide.shapes.add_textbox(0, 0, Pt(100), Pt(100))
+        textbox.text_frame.text = f"Slide text {index}"
+        presentation.save(pptx_path)
+
+        text_path = tmp_path / f"notes_{index}.txt"
+        text_path.write_text(f"Notes {index}")
+
+        paths += [str(docx_path), str(pptx_path), str(text_path)]
+
+    documents_loader = DocumentsLoader(paths)
+    try:
+        asyncio.run(documents_loader.load_documents(str(tmp_path)))
+    finally:
+        PROCESS_POOL_SERVICE.shutdown()
+
+    documents = documents_loader.documents
+    assert len(documents) == 9
+    for index in range(3):
+        assert documents[index * 3] == f"Word document {index}"
+        assert f"# Slide 1\nSlide text {index}\n" in documents[index * 3 + 1]
+        assert documents[index * 3 + 2] == f"Notes {index}"
+    assert documents_loader.images == [[]] * 9
+
+
+def write_pdf(path, page_texts):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None]
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{each} 0 R" for each in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for index, each in enumerate(objects):
+        offsets.append(len(content))
+        content += f"{index + 1} 0 obj\n{each}\nendobj\n".encode()
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        content += f"{offset:010} 00000 n \n".encode()
+    content += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    path.write_bytes(content)
+
+
+def test_pdf_pages_are_extracted_in_shards(tmp_path, monkeypatch):
+    use_temp_document_cache(tmp_path, monkeypatch)
+    monkeypatch.setenv("PDF_PAGES_PER_SHARD", "3")
+    pdf_path = tmp_path / "document.pdf"
+    write_pdf(pdf_path, [f"Page {index}" for index in range(8)])
+
+    documents_loader = DocumentsLoader([str(pdf_path)])
+    try:
+        asyncio.run(documents_loader.load_documents(str(tmp_path)))
+    finally:
+        PROCESS_POOL_SERVICE.shutdown()
+
+    assert documents_loader.documents == ["".join(f"Page {i}" for i in range(8))]
+
+
+def test_parsed_documents_are_cached_by_content(tmp_path, monkeypatch):
+    use_temp_document_cache(tmp_path, monkeypatch)
+    pdf_path = tmp_path / "document.pdf"
+    write_pdf(pdf_path, ["Cached page", "Second page"])
+
+    def load():
+        documents_loader = DocumentsLoader([str(pdf_path)])
+        asyncio.run(documents_loader.load_documents(str(tmp_path), load_images=True))
+        return documents_loader
+
+    try:
+        first_loader = load()
+    finally:
+        PROCESS_POOL_SERVICE.shutdown()
+
+    # A copy of the file with a new name and mtime hits the cache
+    monkeypatch.setattr(PROCESS_POOL_SERVICE, "run", None)
+    monkeypatch.setattr(loader, "get_page_images_from_pdf_async", None)
+    pdf_path = tmp_path / "copy.pdf"
+    pdf_path.write_bytes((tmp_path / "document.pdf").read_bytes())
+    second_loader = load()
+
+    assert second_loader.documents == first_loader.documents
+    assert len(second_loader.images[0]) == 2
+    for path, cached_path in zip(first_loader.images[0], second_loader.images[0]):
+        assert path != cached_path
+        with open(path, "rb") as f, open(cached_path, "rb") as cached_f:
+            assert f.read() == cached_f.read()
@@ -0,0 +1,143 @@
+import asyncio
+import io
+import os
+import threading
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pptx import Presentation
+
+from api.models import LogMetadata
+from api.routers.presentation.handlers.export_as_pptx import (
+    STREAM_CHUNK_SIZE,
+    ExportAsPptxHandler,
+    PptxStreamWriter,
+)
+from api.routers.presentation.models import ExportAsRequest
+from api.routers.presentation.router import presentation_router
+from api.services.database import get_sql_session, migrate_database
+from api.services.instances import PROCESS_POOL_SERVICE
+from api.services.logging import LoggingService
+from api.sql_models import PresentationSqlModel
+
+app = FastAPI()
+app.include_router(presentation_router)
+
+
+def test_export_as_pptx_stream():
+    migrate_database()
+    presentation = PresentationSqlModel(n_slides=1, title="Quarterly Résumé")
+    presentation_id = presentation.id
+    with get_sql_session() as sql_session:
+        sql_session.add(presentation)
+        sql_session.commit()
+
+    pptx_model = {
+        "background_color": "ffffff",
+        "slides": [
+            {
+                "shapes": [
+                    {
+                        "position": {"left": 10, "top": 10, "width": 300},
+                        "paragraphs": [
+                            {
+                                "text": "Hello **world**",
+                                "font": {"name": "Inter", "size": 20},
+                            }
+                        ],
+                    }
+                ]
+            }
+        ],
+    }
+
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/v1/ppt/presentation/export_as_pptx/stream",
+                params={"persist": True},
+                json={"presentation_id": presentation_id, "pptx_model": pptx_model},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == (
+            'attachment; filename="Quarterly_R_sum_.pptx"; '
+            "filename*=UTF-8''Quarterly_R%C3%A9sum%C3%A9.pptx"
+        )
+        # Deck is sent while it is written, its size is not known upfront
+        assert "content-length" not in response.headers
+        slides = Presentation(io.BytesIO(response.content)).slides
+        assert slides[0].shapes[0].text_frame.text == "Hello world"
+
+        with get_sql_session() as sql_session:
+            ppt_path = sql_session.get(PresentationSqlModel, presentation_id).file
+        with open(ppt_path, "rb") as f:
+            assert f.read() == response.content
+    finally:
+        PROCESS_POOL_SERVICE.shutdown()
+        with get_sql_session() as sql_session:
+            sql_session.delete(sql_session.get(PresentationSqlModel, presentation_id))
+            sql_session.commit()
+
+
+def test_stream_writer_sends_chunks_while_saving():
+    writer = PptxStreamWriter()
+    first_chunk_sent = threading.Event()
+
+    def save():
+        writer.write(b"a" * STREAM_CHUNK_SIZE)
+        first_chunk_sent.wait(5)
+        writer.write(b"b")
+        writer.close()
+
+    thread = threading.Thread(target=save)
+    thread.start()
+    chunks = writer.iterate()
+    assert next(chunks) == b"a" * STREAM_CHUNK_SIZE
+    first_chunk_sent.set()
+    assert list(chunks) == [b"b"]
+    thread.join()
+
+
+def test_client_disconnect_is_not_a_save_failure(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    saved = threading.Event()
+
+    def save(writer):
+        try:
+            for _ in range(100):
+                writer.write(b"a" * STREAM_CHUNK_SIZE)
+        finally:
+            saved.set()
+
+    ppt_creator = SimpleNamespace(
+        save=save,
+        get_images_report=lambda: SimpleNamespace(model_dump=lambda mode: {}),
+    )
+
+    async def create_ppt():
+        return ppt_creator
+
+    async def get_ppt_name():
+        return "presentation.pptx"
+
+    handler = ExportAsPptxHandler(
+        ExportAsRequest(
+            presentation_id="presentation",
+            pptx_model={"background_color": "ffffff", "slides": []},
+        )
+    )
+    monkeypatch.setattr(handler, "create_ppt", create_ppt)
+    monkeypatch.setattr(handler, "get_ppt_name", get_ppt_name)
+
+    async def run():
+        response = await handler.stream(LoggingService("test"), LogMetadata())
+        body = response.body_iterator
+        assert len(await anext(body)) == STREAM_CHUNK_SIZE
+        # Client disconnects after the first chunk
+        await body.aclose()
+        await asyncio.to_thread(saved.wait, 5)
+        await response.background()
+
+    asyncio.run(run())
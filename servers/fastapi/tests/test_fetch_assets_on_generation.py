@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+
+from api.routers.presentation.mixins import fetch_assets_on_generation
+from api.routers.presentation.mixins.fetch_assets_on_generation import (
+    FetchAssetsOnPresentationGenerationMixin,
+)
+from ppt_generator.models.content_type_models import (
+    HeadingModel,
+    Type1Content,
+    Type7Content,
+)
+from ppt_generator.models.slide_model import SlideModel
+
+
+def test_assets_are_reported_as_soon_as_they_resolve(monkeypatch):
+    async def generate_image(image_prompt, output_directory):
+        await asyncio.sleep(float(image_prompt.image_prompt))
+        return f"{image_prompt.image_prompt}.png"
+
+    monkeypatch.setattr(fetch_assets_on_generation, "generate_image", generate_image)
+
+    handler = FetchAssetsOnPresentationGenerationMixin()
+    handler.theme = None
+    handler.presentation_id = "presentation"
+    slide_models = [
+        SlideModel(
+            index=index,
+            type=1,
+            presentation="presentation",
+            content=Type1Content(title="Title", body="Body", image_prompts=[delay]),
+        )
+        for index, delay in enumerate(["0.1", "0.2"])
+    ]
+
+    async def fetch():
+        # Assets of the first slide start while the second one is generated
+        assets_tasks = {0: handler.start_slide_assets(slide_models[0])}
+        await asyncio.sleep(0.15)
+        events = []
+        started_at = time.monotonic()
+        async for event in handler.fetch_slide_assets(slide_models, assets_tasks):
+            events.append(json.loads(event.split("data: ")[1]))
+        return events, time.monotonic() - started_at
+
+    events, elapsed = asyncio.run(fetch())
+
+    # First slide assets are already fetched, nothing waits on a polling interval
+    assert elapsed < 0.4
+    assert events[0]["status"] == "Fetching slide assets"
+    assert [(each["slide"], each["path"]) for each in events[1:3]] == [
+        (0, "0.1.png"),
+        (1, "0.2.png"),
+    ]
+    assert events[3]["status"] == "Slide assets fetched"
+    assert [each.images for each in slide_models] == [["0.1.png"], ["0.2.png"]]
+
+
+def test_icon_vector_store_is_loaded_once_per_handler(monkeypatch):
+    vector_stores = []
+
+    def get_icons_vectorstore():
+        vector_stores.append(object())
+        return vector_stores[-1]
+
+    async def get_icon(vector_store, icon_query):
+        assert vector_store is vector_stores[0]
+        return f"{icon_query.icon_query}.svg"
+
+    monkeypatch.setattr(
+        fetch_assets_on_generation, "get_icons_vectorstore", get_icons_vectorstore
+    )
+    monkeypatch.setattr(fetch_assets_on_generation, "get_icon", get_icon)
+
+    handler = FetchAssetsOnPresentationGenerationMixin()
+    handler.theme = None
+    handler.presentation_id = "presentation"
+    slide_models = [
+        SlideModel(
+            index=index,
+            type=7,
+            presentation="presentation",
+            content=Type7Content(
+                title="Title",
+                body=[HeadingModel(heading="Heading", description="Description")],
+                icon_queries=[f"icon {index}"],
+            ),
+        )
+        for index in range(3)
+    ]
+
+    async def fetch():
+        async for _ in handler.fetch_slide_assets(slide_models):
+            pass
+
+    asyncio.run(fetch())
+
+    assert len(vector_stores) == 1
+    assert [each.icons for each in slide_models] == [
+        ["icon 0.svg"],
+        ["icon 1.svg"],
+        ["icon 2.svg"],
+    ]
@@ -4,6 +4,8 @@ load_dotenv()
 
 import asyncio
 import os
+from api.services.disk_cache import DiskCacheService
+from image_processor import images_finder
 from image_processor.images_finder import generate_image
 from ppt_generator.models.query_and_prompt_models import (
     ImagePromptWithThemeAndAspectRatio,
@@ -19,3 +21,26 @@ def test_generate_image():
     output_path = os.path.join(os.getenv("TEMP_DIRECTORY"), "test_image.jpg")
 
     asyncio.run(generate_image(prompt, output_path))
+
+
+def test_cached_image_keeps_its_extension(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    image_cache_service = DiskCacheService("images", max_size=1024 * 1024)
+    monkeypatch.setattr(images_finder, "IMAGE_CACHE_SERVICE", image_cache_service)
+    monkeypatch.setattr(images_finder, "is_ollama_selected", lambda: True)
+    monkeypatch.setattr(images_finder, "is_custom_llm_selected", lambda: False)
+
+    prompt = ImagePromptWithThemeAndAspectRatio(
+        image_prompt="A lighthouse", theme_prompt="", aspect_ratio="16:9"
+    )
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"png")
+    image_cache_service.put_file(
+        image_cache_service.get_key("pexels", "A lighthouse", None, "16:9"),
+        str(image_path),
+    )
+
+    cached_image_path = asyncio.run(generate_image(prompt, str(tmp_path)))
+    assert cached_image_path.endswith(".png")
+    with open(cached_image_path, "rb") as f:
+        assert f.read() == b"png"
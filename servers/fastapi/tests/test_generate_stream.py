@@ -0,0 +1,195 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from api.models import LogMetadata
+from api.routers.presentation.handlers import generate_stream
+from api.routers.presentation.handlers.generate_stream import (
+    PresentationGenerateStreamHandler,
+)
+from api.routers.presentation.mixins import fetch_assets_on_generation
+from api.routers.presentation.models import PresentationGenerateRequest
+from api.services.logging import LoggingService
+from ppt_config_generator.models import SlideMarkdownModel
+
+
+def get_slide_json(index: int) -> str:
+    return json.dumps(
+        {
+            "type": 1,
+            "content": {
+                "title": f"Slide {index}",
+                "body": "Body",
+                "image_prompt": f"slide {index}",
+            },
+        }
+    )
+
+
+def get_handler(tmp_path, monkeypatch, chunks, started_prompts, streamed_prompts):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+
+    async def generate_image(image_prompt, output_directory):
+        started_prompts.append(image_prompt.image_prompt)
+        # Later slides resolve first, assets must still go to their own slide
+        await asyncio.sleep(0.2 - 0.1 * int(image_prompt.image_prompt[-1]))
+        return f"{image_prompt.image_prompt}.png"
+
+    async def get_events():
+        for chunk in chunks:
+            if isinstance(chunk, BaseException):
+                raise chunk
+            if isinstance(chunk, float):
+                # LLM still generating the rest of the presentation
+                await asyncio.sleep(chunk)
+                continue
+            # Lets tasks started by the previous chunk run
+            await asyncio.sleep(0.01)
+            streamed_prompts.append(list(started_prompts))
+            delta = SimpleNamespace(content=chunk)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def generate_presentation_stream(*args):
+        return get_events()
+
+    monkeypatch.setattr(fetch_assets_on_generation, "generate_image", generate_image)
+    monkeypatch.setattr(
+        generate_stream, "generate_presentation_stream", generate_presentation_stream
+    )
+
+    handler = PresentationGenerateStreamHandler("presentation", str(uuid.uuid4()))
+    handler.theme = None
+    handler.title = "Title"
+    handler.outlines = []
+    handler.presentation = SimpleNamespace(id="presentation", notes=None)
+    handler.slide_models = []
+    handler.slide_assets_tasks = {}
+    return handler
+
+
+def test_slide_assets_are_fetched_while_streaming(tmp_path, monkeypatch):
+    started_prompts = []
+    # Prompts started before each chunk is streamed
+    streamed_prompts = []
+    chunks = ['{"slides": [', get_slide_json(0), ", ", get_slide_json(1), "]}"]
+    handler = get_handler(
+        tmp_path, monkeypatch, chunks, started_prompts, streamed_prompts
+    )
+
+    async def run():
+        async for _ in handler.generate_presentation_openai_google():
+            pass
+        async for _ in handler.fetch_slide_assets(
+            handler.slide_models, handler.slide_assets_tasks
+        ):
+            pass
+
+    asyncio.run(run())
+
+    # Assets of the first slide start before the second slide is streamed
+    assert streamed_prompts[1:4] == [[], ["slide 0"], ["slide 0"]]
+    assert started_prompts == ["slide 0", "slide 1"]
+    # Slide 1 assets resolve first and are still matched to it by index
+    assert {
+        index: [task.result() for _, _, task in slide_assets]
+        for index, slide_assets in handler.slide_assets_tasks.items()
+    } == {0: ["slide 0.png"], 1: ["slide 1.png"]}
+    assert [each.images for each in handler.slide_models] == [
+        ["slide 0.png"],
+        ["slide 1.png"],
+    ]
+
+
+def test_slide_assets_are_reported_while_streaming(tmp_path, monkeypatch):
+    chunks = [
+        '{"slides": [',
+        get_slide_json(0),
+        ", ",
+        get_slide_json(1),
+        0.3,
+        "]}",
+    ]
+    handler = get_handler(tmp_path, monkeypatch, chunks, [], [])
+
+    async def run():
+        reported_tasks = set()
+        events = [
+            each
+            async for each in handler.stream_slide_assets(
+                handler.generate_presentation_openai_google(),
+                handler.slide_assets_tasks,
+                reported_tasks,
+            )
+        ]
+        events += [
+            each
+            async for each in handler.fetch_slide_assets(
+                handler.slide_models, handler.slide_assets_tasks, reported_tasks
+            )
+        ]
+        return [json.loads(each.split("data: ")[1]) for each in events]
+
+    events = asyncio.run(run())
+
+    # Both assets resolve before the LLM sends the last chunk
+    last_chunk = next(
+        index for index, each in enumerate(events) if each.get("chunk") == "]}"
+    )
+    assert [
+        (each["slide"], each["path"]) for each in events[:last_chunk] if "path" in each
+    ] == [(1, "slide 1.png"), (0, "slide 0.png")]
+    # Nothing is left to fetch once the generation is done
+    assert [each.get("status") for each in events[last_chunk + 1 :]] == [
+        "Slide assets fetched"
+    ]
+    assert [each.images for each in handler.slide_models] == [
+        ["slide 0.png"],
+        ["slide 1.png"],
+    ]
+
+
+def test_pending_assets_are_cancelled_when_the_stream_fails(tmp_path, monkeypatch):
+    started_prompts = []
+    chunks = ['{"slides": [', get_slide_json(0), ", ", RuntimeError("Stream failed")]
+    handler = get_handler(tmp_path, monkeypatch, chunks, started_prompts, [])
+
+    class SqlSession:
+        async def get(self, *args):
+            return handler.presentation
+
+        async def exec(self, *args):
+            pass
+
+        async def commit(self):
+            pass
+
+        async def refresh(self, *args):
+            pass
+
+    @asynccontextmanager
+    async def get_async_sql_session():
+        yield SqlSession()
+
+    monkeypatch.setattr(generate_stream, "get_async_sql_session", get_async_sql_session)
+    monkeypatch.setattr(generate_stream, "is_ollama_selected", lambda: False)
+    monkeypatch.setattr(generate_stream, "is_custom_llm_selected", lambda: False)
+    handler.outlines = [SlideMarkdownModel(title="Slide 0", body="Body")]
+    handler.data = PresentationGenerateRequest(
+        presentation_id="presentation", outlines=handler.outlines
+    )
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            async for _ in handler.get_stream(LoggingService("test"), LogMetadata()):
+                pass
+        # Cancellation is delivered on the next iteration of the loop, checked
+        # before asyncio.run cancels whatever is left
+        await asyncio.sleep(0)
+        return [task.cancelled() for _, _, task in handler.slide_assets_tasks[0]]
+
+    assert asyncio.run(run()) == [True]
+    assert started_prompts == ["slide 0"]
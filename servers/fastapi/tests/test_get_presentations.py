@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from api.models import LogMetadata
+from api.routers.presentation.handlers.get_presentations import (
+    GetPresentationsHandler,
+)
+from api.services import database
+from api.services.database import get_sql_session
+from api.services.logging import LoggingService
+from api.sql_models import PresentationSqlModel, SlideSqlModel
+
+
+def get_presentations(limit=None, after=None):
+    return asyncio.run(
+        GetPresentationsHandler(limit, after).get(LoggingService("test"), LogMetadata())
+    )
+
+
+def test_get_presentations_paginated(tmp_path, monkeypatch):
+    # Rows are written to a temporary database instead of the app one
+    database_path = tmp_path / "fastapi.db"
+    sql_engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(sql_engine)
+    monkeypatch.setattr(database, "sql_engine", sql_engine)
+    monkeypatch.setattr(
+        database,
+        "_async_sql_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool),
+    )
+
+    presentations = [
+        PresentationSqlModel(n_slides=2, created_at=datetime(2100, 1, day))
+        for day in range(1, 4)
+    ]
+    # Presentations without slides are not listed
+    empty_presentation = PresentationSqlModel(
+        n_slides=2, created_at=datetime(2100, 1, 5)
+    )
+    slides = [
+        SlideSqlModel(index=index, type=1, presentation=each.id, content={})
+        for each in presentations
+        for index in range(2)
+    ]
+    expected_ids = [each.id for each in reversed(presentations)]
+
+    with get_sql_session() as sql_session:
+        sql_session.add_all([*presentations, empty_presentation, *slides])
+        sql_session.commit()
+
+    first_page = get_presentations(limit=2)
+    assert [each.id for each in first_page] == expected_ids[:2]
+    assert all(each.slide.index == 0 for each in first_page)
+
+    second_page = get_presentations(limit=2, after=first_page[-1].id)
+    assert [each.id for each in second_page] == expected_ids[2:]
+    assert second_page[0].slide.presentation == expected_ids[2]
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+from api.services.image_scheduler import ImageSchedulerService
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str):
+        self.headers = {"retry-after": retry_after}
+
+
+def test_image_scheduler_caps_concurrency_and_retries_rate_limits(monkeypatch):
+    monkeypatch.setenv("TEST_IMAGE_MAX_CONCURRENCY", "2")
+    image_scheduler = ImageSchedulerService()
+
+    in_flight = 0
+    max_in_flight = 0
+    calls = []
+    rate_limited = False
+
+    async def generate(index: int):
+        nonlocal in_flight, max_in_flight, rate_limited
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        calls.append((index, time.monotonic()))
+        try:
+            await asyncio.sleep(0.01)
+            if not rate_limited:
+                rate_limited = True
+                raise FakeRateLimitError("0.1")
+            return index
+        finally:
+            in_flight -= 1
+
+    async def run():
+        return await asyncio.gather(
+            *[image_scheduler.run("test", generate, index) for index in range(6)]
+        )
+
+    assert asyncio.run(run()) == list(range(6))
+    assert max_in_flight == 2
+    # Retry-After pauses every call to the provider, not only the failed one
+    assert len(calls) == 7
+    first_call_at = calls[0][1]
+    assert all(called_at - first_call_at >= 0.1 for _, called_at in calls[2:])
+
+
+def test_image_scheduler_raises_other_errors_without_retrying():
+    image_scheduler = ImageSchedulerService()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        raise ValueError("Invalid prompt")
+
+    with pytest.raises(ValueError):
+        asyncio.run(image_scheduler.run("test", generate))
+    assert len(calls) == 1
+
+
+def test_image_scheduler_token_bucket(monkeypatch):
+    monkeypatch.setenv("TEST_IMAGE_MAX_CONCURRENCY", "1")
+    monkeypatch.setenv("TEST_IMAGE_REQUESTS_PER_MINUTE", "600")
+    image_scheduler = ImageSchedulerService()
+
+    async def generate():
+        return time.monotonic()
+
+    async def run():
+        return await asyncio.gather(
+            *[image_scheduler.run("test", generate) for _ in range(3)]
+        )
+
+    called_at = asyncio.run(run())
+    # One token is available up front, the rest refill at 10 per second
+    assert called_at[2] - called_at[0] >= 0.19
@@ -0,0 +1,15 @@
+from api.models import SelectedLLMProvider
+from api.utils import model_utils
+
+
+def test_invalid_llm_concurrency_falls_back_to_default(monkeypatch):
+    monkeypatch.setattr(
+        model_utils, "get_selected_llm_provider", lambda: SelectedLLMProvider.CUSTOM
+    )
+
+    monkeypatch.setenv("CUSTOM_LLM_CONCURRENCY", "8")
+    assert model_utils.get_llm_concurrency() == 8
+    monkeypatch.setenv("CUSTOM_LLM_CONCURRENCY", "eight")
+    assert model_utils.get_llm_concurrency() == 4
+    monkeypatch.setenv("CUSTOM_LLM_CONCURRENCY", "0")
+    assert model_utils.get_llm_concurrency() == 1
@@ -0,0 +1,49 @@
+from ppt_generator.models.pptx_models import (
+    PptxFontModel,
+    PptxPresentationModel,
+)
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+from ppt_generator.utils import tokenize_markdown_line
+
+
+def test_tokenize_markdown_line():
+    assert tokenize_markdown_line("plain") == (("plain", False, False),)
+    assert tokenize_markdown_line("a **b** __c__ ***d***") == (
+        ("a ", False, False),
+        ("b", True, False),
+        (" ", False, False),
+        ("c", False, True),
+        (" ", False, False),
+        ("d", True, True),
+    )
+    assert tokenize_markdown_line("***a**") == (("*a", True, False),)
+    # Unmatched markers are literal text
+    assert tokenize_markdown_line("**bold** and 2 ** 3 __") == (
+        ("bold", True, False),
+        (" and 2 ** 3 __", False, False),
+    )
+
+
+def test_parse_markdown_text_to_text_runs(tmp_path):
+    ppt_creator = PptxPresentationCreator(
+        PptxPresentationModel(background_color="ffffff", slides=[]), str(tmp_path)
+    )
+    font = PptxFontModel(name="Roboto", size=20)
+    text_runs = ppt_creator.parse_markdown_text_to_text_runs(
+        font, "- **One**\n- two\n- **One**"
+    )
+
+    assert [each.text for each in text_runs] == [
+        "- ",
+        "One",
+        "\n",
+        "- two",
+        "\n",
+        "- ",
+        "One",
+    ]
+    assert text_runs[0].font is font
+    assert text_runs[1].font == PptxFontModel(name="Roboto", size=20, bold=True)
+    # Derived fonts are shared and the newline is only between lines
+    assert text_runs[1].font is text_runs[6].font
+    assert text_runs[2].font is None
@@ -0,0 +1,60 @@
+from PIL import Image
+
+from ppt_generator.models.pptx_models import (
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureTransformModel,
+)
+from ppt_generator.picture_transform import transform_picture
+
+
+def get_transform(path, **kwargs) -> PptxPictureTransformModel:
+    return PptxPictureTransformModel(
+        path=str(path), width=120, height=120, dpi=144, jpeg_quality=85, **kwargs
+    )
+
+
+def test_pictures_are_downscaled_to_box_resolution(tmp_path):
+    image_path = tmp_path / "photo.png"
+    Image.new("RGB", (1024, 1024), (10, 120, 200)).save(image_path)
+
+    # Opaque pictures become JPEG, transparent ones stay PNG
+    output_path = transform_picture(get_transform(image_path), str(tmp_path / "a"))
+    assert output_path.endswith(".jpg")
+    with Image.open(output_path) as image:
+        assert image.size == (240, 240)
+
+    output_path = transform_picture(
+        get_transform(image_path, border_radius=[20, 20, 20, 20]),
+        str(tmp_path / "b"),
+    )
+    assert output_path.endswith(".png")
+    with Image.open(output_path) as image:
+        assert image.size == (240, 240)
+        assert image.getpixel((0, 0))[3] == 0
+
+
+def test_pictures_are_never_upscaled(tmp_path):
+    image_path = tmp_path / "icon.png"
+    Image.new("RGBA", (64, 32), (255, 0, 0, 128)).save(image_path)
+
+    output_path = transform_picture(
+        get_transform(
+            image_path, object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.CONTAIN)
+        ),
+        str(tmp_path / "a"),
+    )
+    with Image.open(output_path) as image:
+        assert image.size == (64, 64)
+
+    output_path = transform_picture(
+        get_transform(image_path, clip=False), str(tmp_path / "b")
+    )
+    with Image.open(output_path) as image:
+        assert image.size == (64, 32)
+
+    # JPEG pictures that need no resampling are embedded untouched
+    jpeg_path = tmp_path / "small.jpg"
+    Image.new("RGB", (100, 100)).save(jpeg_path)
+    transform = get_transform(jpeg_path, clip=False)
+    assert transform_picture(transform, str(tmp_path / "c")) == str(jpeg_path)
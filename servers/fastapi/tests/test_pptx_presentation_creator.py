@@ -0,0 +1,212 @@
+import asyncio
+import os
+
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from api.services.disk_cache import DiskCacheService
+from api.services.instances import PROCESS_POOL_SERVICE
+from ppt_generator import pptx_presentation_creator
+from ppt_generator.models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from ppt_generator.pptx_presentation_creator import PptxPresentationCreator
+
+
+def use_temp_caches(tmp_path, monkeypatch):
+    # Exports of earlier runs must not be served from the app caches
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    for attribute, name in [
+        ("PICTURE_CACHE_SERVICE", "pictures"),
+        ("SLIDE_CACHE_SERVICE", "slides"),
+    ]:
+        monkeypatch.setattr(
+            pptx_presentation_creator,
+            attribute,
+            DiskCacheService(name, max_size=64 * 1024 * 1024),
+        )
+
+
+def test_pictures_are_transformed_in_process_pool(tmp_path, monkeypatch):
+    use_temp_caches(tmp_path, monkeypatch)
+    image_path = tmp_path / "image.png"
+    Image.new("RGB", (200, 100), (10, 120, 200)).save(image_path)
+
+    def picture_box(**kwargs):
+        return PptxPictureBoxModel(
+            position=PptxPositionModel(left=10, top=10, width=80, height=80),
+            picture=PptxPictureModel(is_network=False, path=str(image_path)),
+            **kwargs,
+        )
+
+    ppt_model = PptxPresentationModel(
+        background_color="ffffff",
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    picture_box(shape=PptxBoxShapeEnum.CIRCLE),
+                    picture_box(overlay="00ff00", border_radius=[8, 8, 8, 8]),
+                    picture_box(clip=False),
+                ]
+            ),
+            PptxSlideModel(
+                shapes=[
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(width=80, height=80),
+                        picture=PptxPictureModel(
+                            is_network=False, path=str(tmp_path / "missing.png")
+                        ),
+                    )
+                ]
+            ),
+        ],
+    )
+
+    ppt_creator = PptxPresentationCreator(ppt_model, str(tmp_path))
+    try:
+        asyncio.run(ppt_creator.prepare_pictures())
+    finally:
+        PROCESS_POOL_SERVICE.shutdown()
+
+    prepared_paths = list(ppt_creator._prepared_pictures.values())
+    assert len(prepared_paths) == 4
+    # Pictures that can not be opened are skipped
+    assert prepared_paths[3] is None
+    # The 80pt box is 166px at the default 150 DPI, capped by the 100px source height
+    with Image.open(prepared_paths[0]) as image:
+        assert image.size == (100, 100)
+        assert image.mode == "RGBA"
+
+    ppt_creator.create_ppt()
+    ppt_path = tmp_path / "presentation.pptx"
+    ppt_creator.save(str(ppt_path))
+
+    slides = Presentation(str(ppt_path)).slides
+    assert [len(slide.shapes) for slide in slides] == [3, 0]
+
+    # Unchanged pictures are served from the picture cache on re-export
+    async def fail(*args, **kwargs):
+        raise AssertionError("Picture processed again")
+
+    monkeypatch.setattr(PROCESS_POOL_SERVICE, "run", fail)
+    cached_creator = PptxPresentationCreator(ppt_model, str(tmp_path))
+    asyncio.run(cached_creator.prepare_pictures())
+    cached_paths = list(cached_creator._prepared_pictures.values())
+    for path, cached_path in zip(prepared_paths[:3], cached_paths[:3]):
+        with open(path, "rb") as f, open(cached_path, "rb") as cached_f:
+            assert f.read() == cached_f.read()
+
+
+def test_unchanged_slides_are_restored_from_slide_cache(tmp_path, monkeypatch):
+    use_temp_caches(tmp_path, monkeypatch)
+    image_path = tmp_path / "image.png"
+    Image.new("RGB", (200, 100), (10, 120, 200)).save(image_path)
+
+    def export(title: str, ppt_path: str) -> PptxPresentationCreator:
+        ppt_model = PptxPresentationModel(
+            background_color="ffffff",
+            slides=[
+                PptxSlideModel(
+                    shapes=[
+                        PptxPictureBoxModel(
+                            position=PptxPositionModel(width=80, height=80),
+                            picture=PptxPictureModel(
+                                is_network=False, path=str(image_path)
+                            ),
+                        ),
+                    ]
+                ),
+                PptxSlideModel(
+                    shapes=[
+                        PptxTextBoxModel(
+                            position=PptxPositionModel(width=300, height=50),
+                            paragraphs=[PptxParagraphModel(text=title)],
+                        )
+                    ]
+                ),
+            ],
+        )
+        ppt_creator = PptxPresentationCreator(ppt_model, str(tmp_path))
+        asyncio.run(ppt_creator.prepare())
+        ppt_creator.create_ppt()
+        ppt_creator.save(ppt_path)
+        return ppt_creator
+
+    def get_slides(ppt_path: str):
+        return [
+            (
+                etree.tostring(slide._element),
+                [
+                    relationship.target_part.blob
+                    for relationship in slide.part.rels.values()
+                    if relationship.reltype == RT.IMAGE
+                ],
+            )
+            for slide in Presentation(ppt_path).slides
+        ]
+
+    try:
+        first_export = export("Title", str(tmp_path / "first.pptx"))
+        second_export = export("Title", str(tmp_path / "second.pptx"))
+        third_export = export("Edited title", str(tmp_path / "third.pptx"))
+    finally:
+        PROCESS_POOL_SERVICE.shutdown()
+
+    assert list(first_export._cached_slides) == []
+    assert list(second_export._cached_slides) == [0, 1]
+    assert list(third_export._cached_slides) == [0]
+
+    first_slides = get_slides(str(tmp_path / "first.pptx"))
+    assert get_slides(str(tmp_path / "second.pptx")) == first_slides
+    assert get_slides(str(tmp_path / "third.pptx"))[0] == first_slides[0]
+
+
+def test_identical_pictures_are_processed_and_embedded_once(tmp_path, monkeypatch):
+    use_temp_caches(tmp_path, monkeypatch)
+    image_path = tmp_path / "logo.png"
+    Image.new("RGB", (200, 100), (10, 120, 200)).save(image_path)
+
+    def picture_box(**kwargs):
+        return PptxPictureBoxModel(
+            position=PptxPositionModel(width=80, height=80),
+            picture=PptxPictureModel(is_network=False, path=str(image_path)),
+            **kwargs,
+        )
+
+    ppt_model = PptxPresentationModel(
+        background_color="ffffff",
+        # Global shapes are added to every slide
+        shapes=[picture_box(overlay="ff0000")],
+        slides=[
+            PptxSlideModel(shapes=[picture_box(), picture_box()]),
+            PptxSlideModel(shapes=[picture_box()]),
+        ],
+    )
+
+    transformed_paths = []
+
+    async def run(func, *args):
+        transformed_paths.append(func(*args))
+        return transformed_paths[-1]
+
+    monkeypatch.setattr(PROCESS_POOL_SERVICE, "run", run)
+    ppt_creator = PptxPresentationCreator(ppt_model, str(tmp_path))
+    asyncio.run(ppt_creator.prepare_pictures())
+    ppt_creator.create_ppt()
+
+    # One clipped and one recolored variant of the logo
+    assert len(transformed_paths) == 2
+    images_report = ppt_creator.get_images_report()
+    assert images_report.distinct_images == 2
+    assert images_report.image_references == 5
+    clipped_size, recolored_size = [os.path.getsize(each) for each in transformed_paths]
+    assert images_report.bytes_saved == 2 * clipped_size + recolored_size
@@ -0,0 +1,49 @@
+import json
+import random
+
+from ppt_generator.stream_parser import SlidesStreamParser
+
+
+def test_slides_are_parsed_as_soon_as_they_are_complete():
+    presentation = {
+        "title": 'Braces { and [ in "strings" \\ ]',
+        "slides": [
+            {
+                "type": index,
+                "content": {
+                    "title": f"Slide {index} }}]",
+                    "slides": [{"nested": True}],
+                    "items": [{"text": '"\\"}'}],
+                },
+            }
+            for index in range(5)
+        ],
+        "notes": [{"not": "a slide"}],
+    }
+    text = json.dumps(presentation, indent=2)
+
+    # Slide objects end with the last closing brace of each slide
+    ends = []
+    decoder = json.JSONDecoder()
+    slides_start = text.index("[", text.index('"slides"'))
+    position = slides_start + 1
+    for _ in presentation["slides"]:
+        position = text.index("{", position)
+        _, position = decoder.raw_decode(text, position)
+        ends.append(position)
+
+    for seed in range(5):
+        rng = random.Random(seed)
+        stream_parser = SlidesStreamParser()
+        slides = []
+        position = 0
+        while position < len(text):
+            end = min(position + rng.randint(1, 40), len(text))
+            for slide in stream_parser.feed(text[position:end]):
+                # Emitted with the chunk holding its closing brace
+                assert position < ends[len(slides)] <= end
+                slides.append(slide)
+            position = end
+
+        assert slides == presentation["slides"]
+        assert stream_parser.text == text
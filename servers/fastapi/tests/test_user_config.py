@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+
+import httpx
+
+from api.services.llm_client import LLMClientService
+from api.services.user_config import UserConfigService
+
+
+def test_user_config_reloads_only_on_file_change(tmp_path, monkeypatch):
+    config_path = tmp_path / "userConfig.json"
+    monkeypatch.setenv("USER_CONFIG_PATH", str(config_path))
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    llm_client_service = LLMClientService()
+    user_config_service = UserConfigService(llm_client_service, watch_file=True)
+
+    assert user_config_service.config.LLM == "openai"
+    assert user_config_service.config.OPENAI_API_KEY is None
+    assert not user_config_service.refresh()
+
+    llm_client = llm_client_service.get_client("https://api.openai.com/v1", "old")
+    with open(config_path, "w") as f:
+        json.dump({"OPENAI_API_KEY": "new"}, f)
+
+    assert user_config_service.refresh()
+    assert user_config_service.config.OPENAI_API_KEY == "new"
+    assert os.environ["OPENAI_API_KEY"] == "new"
+    assert not user_config_service.refresh()
+    assert (
+        llm_client_service.get_client("https://api.openai.com/v1", "old")
+        is not llm_client
+    )
+
+    os.remove(config_path)
+    assert user_config_service.refresh()
+    assert user_config_service.config.OPENAI_API_KEY is None
+    assert user_config_service.config.LLM == "openai"
+
+    # Environment changes made after the service was created are picked up
+    monkeypatch.setenv("OPENAI_API_KEY", "env")
+    assert user_config_service.refresh()
+    assert user_config_service.config.OPENAI_API_KEY == "env"
+
+    with open(config_path, "w") as f:
+        json.dump({"OPENAI_API_KEY": "file"}, f)
+    assert user_config_service.refresh()
+    assert user_config_service.config.OPENAI_API_KEY == "file"
+    assert not user_config_service.refresh()
+
+    os.remove(config_path)
+    assert user_config_service.refresh()
+    assert user_config_service.config.OPENAI_API_KEY == "env"
+
+
+def test_cleared_llm_clients_are_closed_after_their_requests(monkeypatch):
+    async def handle_async_request(self, request):
+        return httpx.Response(200, stream=httpx.ByteStream(b"{}"))
+
+    monkeypatch.setattr(
+        httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request
+    )
+
+    async def run():
+        llm_client_service = LLMClientService()
+        llm_client = llm_client_service.get_client("https://api.openai.com/v1", "key")
+        transport = llm_client_service._clients[("https://api.openai.com/v1", "key")][1]
+        response = await transport.handle_async_request(
+            httpx.Request("GET", "https://api.openai.com/v1/models")
+        )
+
+        llm_client_service.clear()
+        await asyncio.sleep(0.01)
+        # Still streaming its response
+        assert not llm_client.is_closed()
+
+        await response.aclose()
+        await llm_client_service.aclose()
+        assert llm_client.is_closed()
+
+    asyncio.run(run())
+
+
+def test_unwatched_user_config_is_read_once(tmp_path, monkeypatch):
+    config_path = tmp_path / "userConfig.json"
+    monkeypatch.setenv("USER_CONFIG_PATH", str(config_path))
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with open(config_path, "w") as f:
+        json.dump({"OPENAI_API_KEY": "fixed"}, f)
+
+    user_config_service = UserConfigService(LLMClientService(), watch_file=False)
+    assert user_config_service.config.OPENAI_API_KEY == "fixed"
+
+    with open(config_path, "w") as f:
+        json.dump({"OPENAI_API_KEY": "changed"}, f)
+    assert not user_config_service.refresh()
+    assert user_config_service.config.OPENAI_API_KEY == "fixed"
+
+    # Keys the file does not set still follow the environment
+    monkeypatch.setenv("LLM", "google")
+    assert user_config_service.refresh()
+    assert user_config_service.config.LLM == "google"
+    assert user_config_service.config.OPENAI_API_KEY == "fixed"